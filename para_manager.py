@@ -2,16 +2,25 @@ import sys
 import os
 import json
 import shutil
+import errno
 import subprocess
 import traceback
 from datetime import datetime
 import hashlib
-from functools import partial
+from functools import partial, lru_cache
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import re
 import sqlite3
 import tempfile
+import mmap
+import time
+import threading
+import atexit
+from collections import OrderedDict
 
 # Required libraries: pip install PyQt6 send2trash numba pillow
+# Optional: pip install blake3 orjson
 try:
     import send2trash
 except ImportError:
@@ -24,21 +33,42 @@ try:
 except ImportError:
     NUMBA_AVAILABLE = False
 
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Hashes are only ever compared with each other, so use the fastest algorithm available.
+HASH_ALGORITHM = "blake3" if BLAKE3_AVAILABLE else "sha256"
+MMAP_MIN_SIZE = 1024 * 1024 # Smaller files are cheaper to read() than to map
+# Windows and macOS volumes are case-insensitive by default, so name clashes ignore case there
+CASE_INSENSITIVE_FS = sys.platform in ("win32", "darwin")
+
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QFrame, QPushButton, QDialog, QLineEdit,
     QFileDialog, QTableWidget, QTableWidgetItem, QHeaderView, QComboBox,
     QSplitter, QTreeView, QListWidget, QListWidgetItem, QStyle, QMessageBox,
-    QMenu, QInputDialog, QStatusBar, QStackedWidget, QTextBrowser, QProgressDialog,
+    QMenu, QInputDialog, QStatusBar, QStackedWidget, QTextBrowser, QPlainTextEdit, QProgressDialog,
     QCheckBox, QFileIconProvider, QGridLayout, QAbstractItemView, QTreeWidget,
-    QTreeWidgetItem, QRadioButton, QButtonGroup
+    QTreeWidgetItem, QRadioButton, QButtonGroup, QListView, QStyledItemDelegate, QStyleOptionViewItem,
+    QSpinBox
 )
 from PyQt6.QtGui import (
-    QFont, QIcon, QAction, QCursor, QFileSystemModel, QPainter, QPixmap, QColor, QPalette
+    QFont, QIcon, QCursor, QFileSystemModel, QPainter, QPixmap, QColor, QPalette, QFontMetrics,
+    QSyntaxHighlighter, QTextCharFormat, QTextCursor
 )
 from PyQt6.QtCore import (
-    Qt, QUrl, QSize, QModelIndex, QDir, QThread, pyqtSignal, QFileInfo, QTimer, QFileSystemWatcher
+    Qt, QUrl, QSize, QModelIndex, QDir, QThread, pyqtSignal, pyqtSlot, QFileInfo, QTimer, QFileSystemWatcher,
+    QAbstractItemModel, QAbstractListModel, QRect
 )
 
 # --- GLOBAL EXCEPTION HOOK ---
@@ -55,8 +85,12 @@ def global_exception_hook(exctype, value, tb, window=None):
     except (NameError, AttributeError): pass
     try:
         # Note: This log might also fail if the issue is path-related on startup.
-        with open("crash_report.log", "a", encoding="utf-8") as f:
-            f.write(f"\n--- FATAL CRASH AT {datetime.now()} ---\n{traceback_details}")
+        # A raw O_APPEND write is a single unbuffered append, safe even mid-teardown
+        fd = os.open("crash_report.log", os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, f"\n--- FATAL CRASH AT {datetime.now()} ---\n{traceback_details}".encode('utf-8'))
+        finally:
+            os.close(fd)
     except Exception as e:
         print(f"Could not write to crash_report.log: {e}")
     app = QApplication.instance() or QApplication(sys.argv)
@@ -67,8 +101,8 @@ def global_exception_hook(exctype, value, tb, window=None):
     error_box.setInformativeText("The error has been logged to 'crash_report.log'.")
     error_box.setDetailedText(error_message_for_details)
     error_box.setMinimumSize(700, 250)
-    if window:
-        error_box.setStyleSheet(window.styleSheet())
+    if window and (style := window.styleSheet()):
+        error_box.setStyleSheet(style)
     text_edit = error_box.findChild(QTextBrowser)
     if text_edit:
         text_edit.setFont(QFont("Consolas", 10))
@@ -105,27 +139,54 @@ def get_user_data_path(filename):
     
     return os.path.join(data_dir, filename)
 
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+@lru_cache(maxsize=8192)
 def format_size(size_bytes):
     if size_bytes is None or size_bytes < 0: return "N/A"
     if size_bytes == 0: return "0 B"
-    power = 1024
-    n = 0
-    power_labels = {0: 'B', 1: 'KB', 2: 'MB', 3: 'GB', 4: 'TB'}
-    while size_bytes >= power and n < len(power_labels) - 1:
-        size_bytes /= power
-        n += 1
-    return f"{size_bytes:.2f} {power_labels[n]}"
-
-def calculate_hash(file_path, block_size=65536):
-    sha256 = hashlib.sha256()
+    # Each unit is 2**10 of the previous one, so the bit length picks the unit without a loop
+    n = min(max(int(size_bytes).bit_length() - 1, 0) // 10, len(SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * n)):.2f} {SIZE_UNITS[n]}"
+
+def new_hasher(size=0):
+    """Returns a hasher for HASH_ALGORITHM. BLAKE3 spreads large inputs over all CPU cores."""
+    if not BLAKE3_AVAILABLE:
+        return hashlib.sha256()
+    return blake3.blake3(max_threads=blake3.blake3.AUTO) if size >= MMAP_MIN_SIZE else blake3.blake3()
+
+def calculate_hash(file_path, block_size=1 << 20):
     try:
-        with open(file_path, 'rb') as f:
-            for block in iter(lambda: f.read(block_size), b''):
-                sha256.update(block)
-        return sha256.hexdigest()
-    except (IOError, PermissionError):
+        # Unbuffered: readinto() below fills our own buffer directly, with no second copy
+        with open(file_path, 'rb', buffering=0) as f:
+            size = os.fstat(f.fileno()).st_size
+            hasher = new_hasher(size)
+            if size >= MMAP_MIN_SIZE:
+                try:
+                    # One update() over the mapped file instead of a Python-level read loop
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        if hasattr(mmap, "MADV_SEQUENTIAL"): # Not available on Windows
+                            mapped.madvise(mmap.MADV_SEQUENTIAL) # Ask the kernel to read ahead aggressively
+                        hasher.update(mapped)
+                    return hasher.hexdigest()
+                except (OSError, ValueError):
+                    pass # Some network and FUSE filesystems cannot be mapped; stream the file instead
+                if hasattr(hashlib, "file_digest"): # Python 3.11+ runs the read loop for us
+                    return hashlib.file_digest(f, lambda: hasher).hexdigest()
+            # One buffer, sized to the file, so a small file is a single read syscall
+            buf = bytearray(max(1, min(size, block_size)))
+            view = memoryview(buf)
+            while (n := f.readinto(buf)):
+                hasher.update(view[:n])
+        return hasher.hexdigest()
+    except (IOError, PermissionError, ValueError):
         return None
 
+@lru_cache(maxsize=None)
+def standard_icon(pixmap):
+    """The application style's QIcon for a QStyle.StandardPixmap, looked up once and shared."""
+    return QApplication.style().standardIcon(pixmap)
+
 def resource_path(relative_path):
     """Gets the absolute path to a bundled, read-only resource."""
     try:
@@ -134,20 +195,164 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-def get_all_files_in_paths(paths):
-    all_files = []
+def load_json(path):
+    """Reads a JSON file as raw bytes and parses it with orjson when available."""
+    with open(path, "rb") as f:
+        data = f.read()
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers' except clauses still match
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+def save_json(path, obj, indent=4):
+    """Writes JSON to a temp file beside `path` and swaps it in, so a crash never leaves half a file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=indent)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+
+def iter_all_files_in_paths(paths):
+    """Lazily yields every file path in the given files/folders."""
     for path in paths:
-        if os.path.isfile(path): all_files.append(path)
+        if os.path.isfile(path): yield path
         elif os.path.isdir(path):
-            for root, _, files in os.walk(path):
-                for name in files: all_files.append(os.path.join(root, name))
-    return all_files
+            yield from (entry.path for entry in _iter_index(path))
+
+def get_all_files_in_paths(paths):
+    return list(iter_all_files_in_paths(paths))
+
+def _iter_index(root):
+    """Yields os.DirEntry objects for every file under root (single scandir pass)."""
+    # An explicit stack instead of nested generators: each entry is yielded straight from here
+    # rather than through one `yield from` frame per folder level, and only one scandir
+    # handle is open at a time because sub-folders are visited after their parent is closed.
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif not entry.is_dir(): # Symlinked folders are skipped, as os.walk does
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+class _IndexDirs:
+    """
+    Folder view of the file index: {dir: set of file paths} and {dir: set of sub-folders
+    holding indexed files}, so patching one folder never scans every index key.
+    """
+    def __init__(self, paths=()):
+        self.files, self.subdirs = {}, {}
+        for path in paths:
+            self.add(path)
+
+    def add(self, path):
+        folder = os.path.dirname(path)
+        if (files := self.files.get(folder)) is None:
+            files = self.files[folder] = set()
+            # Link the new folder into its ancestors until one already knows it
+            while (parent := os.path.dirname(folder)) != folder:
+                children = self.subdirs.setdefault(parent, set())
+                if folder in children: break
+                children.add(folder)
+                folder = parent
+        files.add(path)
+
+    def discard(self, path):
+        folder = os.path.dirname(path)
+        if (files := self.files.get(folder)) is not None:
+            files.discard(path)
+            self._prune(folder)
+
+    def pop_subtree(self, folder):
+        """Forgets folder and everything below it. Returns the file paths it held."""
+        removed, stack = [], [folder]
+        while stack:
+            d = stack.pop()
+            removed.extend(self.files.pop(d, ()))
+            stack.extend(self.subdirs.pop(d, ()))
+        parent = os.path.dirname(folder)
+        if parent != folder and (children := self.subdirs.get(parent)) is not None:
+            children.discard(folder)
+            self._prune(parent)
+        return removed
+
+    def _prune(self, folder):
+        """Unlinks folders left without indexed files, walking up while they are empty."""
+        while not self.files.get(folder) and not self.subdirs.get(folder):
+            self.files.pop(folder, None)
+            self.subdirs.pop(folder, None)
+            parent = os.path.dirname(folder)
+            if parent == folder or (children := self.subdirs.get(parent)) is None:
+                return
+            children.discard(folder)
+            folder = parent
+
+def iter_files_with_stat(paths):
+    """
+    Yields (path, size) for every file in the given files/folders. Folder contents
+    come from scandir, whose DirEntry.stat() is cached (and free on Windows).
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for entry in _iter_index(path):
+                try: yield entry.path, entry.stat().st_size
+                except OSError: continue
+        else:
+            try: yield path, os.stat(path).st_size
+            except OSError: continue
+
+def add_new_subdirs(root, changed_dirs, watched):
+    """
+    Adds to the `watched` set every sub-folder of `changed_dirs` (inside root) that it
+    does not hold yet, walking only the subtrees of those new folders.
+    """
+    for dir_path in changed_dirs:
+        if dir_path != root and not dir_path.startswith(root + os.sep):
+            continue # Outside the PARA tree (e.g. the source folder of a drop)
+        try:
+            with os.scandir(dir_path) as it:
+                new_dirs = [os.path.normpath(e.path) for e in it if e.is_dir(follow_symlinks=False)]
+        except OSError:
+            continue
+        for new_dir in new_dirs:
+            if new_dir in watched: continue
+            watched.add(new_dir) # A new (or moved-in) folder; its whole subtree is new too
+            for walk_root, dirs, _ in os.walk(new_dir):
+                watched.update(os.path.normpath(os.path.join(walk_root, d)) for d in dirs)
+    return watched
+
+PROGRESS_INTERVAL = 0.05 # Minimum seconds between progress signals from a worker loop
+INDEX_BATCH_SIZE = 1000 # Records per batch streamed from the indexer to the GUI thread
+SEARCH_CACHE_SIZE = 32 # Recent search terms whose results are kept until the index changes
+MOVE_COPY_WORKERS = 4 # Cross-device moves copied at once by a drop; same-device renames stay inline
+INDEX_WALK_WORKERS = min(32, (os.cpu_count() or 4) * 4) # Folders listed and stat'ed at once; I/O-bound, so more than the cores
+
+def maybe_report(progress_callback, message, current, total, state):
+    """
+    Rate-limited progress: forwards to progress_callback at most every
+    PROGRESS_INTERVAL seconds, and always for the last item. `state` is a
+    one-element list holding the time of the last report, owned by the caller's loop.
+    """
+    now = time.monotonic()
+    if (total and current >= total) or now - state[0] >= PROGRESS_INTERVAL:
+        state[0] = now
+        progress_callback(message, current, total)
 
 # --- HELPER & WORKER CLASSES ---
 class Worker(QThread):
     result = pyqtSignal(object)
     error = pyqtSignal(str)
     progress = pyqtSignal(str, int, int)
+    batch_ready = pyqtSignal(object)
     def __init__(self, func, *args, **kwargs):
         super().__init__()
         self.func = func
@@ -161,42 +366,173 @@ class Worker(QThread):
             self.error.emit(traceback.format_exc())
 
 class Logger:
+    # Fixed-width "YYYY-MM-DD " prefix; a byte regex is far cheaper than strptime per line
+    _DATE_RE = re.compile(rb'(\d{4}-\d{2}-\d{2}) ')
+    _TAIL_BLOCK = 1 << 16 # Bytes read per step when paging backwards through a day
+
     def __init__(self, filename="para_manager.log"):
         self.log_file = filename # Expect a full path
+        self.index_file = filename + ".idx" # "<date> <byte offset>" for the first line of each day
         self.log_format = "{timestamp} [{level:<8}] {message}"
+        # Workers log from their own threads; the lock keeps lines from interleaving
+        self._lock = threading.Lock()
+        self._date_runs = self._load_date_index() # [(date_str, offset)] in file order
+        try: self._offset = os.path.getsize(self.log_file)
+        except OSError: self._offset = 0
+        # One handle for the whole session instead of open/write/close per message
+        try:
+            self._fh = open(self.log_file, 'a', encoding='utf-8', buffering=1 << 16)
+            atexit.register(self._fh.close)
+        except OSError as e:
+            self._fh = None
+            print(f"FATAL: Could not open log file {self.log_file}: {e}")
         self.info("Logger initialized.")
-    def _write(self, level, message):
+    def _write(self, level, message, flush=False):
+        if self._fh is None: return
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        line = self.log_format.format(timestamp=timestamp, level=level, message=message) + "\n"
         try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(self.log_format.format(timestamp=timestamp, level=level, message=message) + "\n")
+            with self._lock:
+                date_str = timestamp[:10]
+                if not self._date_runs or self._date_runs[-1][0] != date_str:
+                    self._add_date_run(date_str, self._offset)
+                self._fh.write(line)
+                # Text mode writes "\r\n" on Windows, so count the translated newlines too
+                self._offset += len(line.encode('utf-8')) + (line.count("\n") if os.linesep != "\n" else 0)
+                if flush: self._fh.flush()
         except Exception as e:
             print(f"FATAL: Could not write to log file {self.log_file}: {e}")
+    def flush(self):
+        """Pushes buffered lines to disk, e.g. before the log file is read back."""
+        if self._fh is None: return
+        with self._lock:
+            try: self._fh.flush()
+            except OSError: pass
     def info(self, message): self._write("INFO", message)
     def warn(self, message): self._write("WARNING", message)
     def error(self, message, exc_info=False):
         if exc_info: message += f"\n{traceback.format_exc()}"
-        self._write("ERROR", message)
-    def get_log_dates(self):
-        dates = set()
+        self._write("ERROR", message, flush=True) # Errors hit the disk at once in case a crash follows
+
+    # --- Date index: lets the log viewer jump to one day instead of scanning the whole file ---
+    def _load_date_index(self):
+        """Reads the sidecar index, rebuilding it from the log if it is missing or does not match."""
+        try: log_size = os.path.getsize(self.log_file)
+        except OSError: log_size = 0
+        runs = []
         try:
-            with open(self.log_file, 'r', encoding='utf-8') as f:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
                 for line in f:
-                    if len(line) >= 10:
-                        try:
-                            datetime.strptime(line[:10], '%Y-%m-%d')
-                            dates.add(line[:10])
-                        except ValueError: continue
-        except FileNotFoundError: pass
-        return sorted(list(dates), reverse=True)
+                    date_str, offset = line.split()
+                    runs.append((date_str, int(offset)))
+            if (runs and runs[-1][1] < log_size) or (not runs and not log_size):
+                return runs
+        except (OSError, ValueError):
+            pass
+        return self._rebuild_date_index()
+    def _rebuild_date_index(self):
+        runs = []
+        try:
+            with open(self.log_file, 'rb') as f:
+                offset = 0
+                for line in f:
+                    if (m := self._DATE_RE.match(line)):
+                        date_str = m.group(1).decode('ascii')
+                        if not runs or runs[-1][0] != date_str:
+                            runs.append((date_str, offset))
+                    offset += len(line)
+        except OSError:
+            pass
+        try:
+            with open(self.index_file, 'w', encoding='utf-8') as f:
+                f.writelines(f"{date_str} {offset}\n" for date_str, offset in runs)
+        except OSError:
+            pass
+        return runs
+    def _add_date_run(self, date_str, offset):
+        self._date_runs.append((date_str, offset))
+        try:
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(f"{date_str} {offset}\n")
+        except OSError:
+            pass
+    def get_log_dates(self):
+        with self._lock:
+            return sorted({date_str for date_str, _ in self._date_runs}, reverse=True)
     def get_logs_for_date(self, date_str):
+        self.flush()
+        with self._lock:
+            runs = list(self._date_runs)
+        # Only the byte ranges that belong to this day are read; None runs to the end of the file
+        ranges = [(start, runs[i + 1][1] if i + 1 < len(runs) else None)
+                  for i, (run_date, start) in enumerate(runs) if run_date == date_str]
         logs = []
         try:
-            with open(self.log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.startswith(date_str): logs.append(line.strip())
+            with open(self.log_file, 'rb') as f:
+                for chunk in self._iter_ranges(f, ranges):
+                    # A list comprehension plus one join beat a StringIO writer in CPython
+                    logs += [line.strip() for line in chunk.splitlines() if line.startswith(date_str)]
         except FileNotFoundError: pass
         return "\n".join(logs)
+    @staticmethod
+    def _iter_ranges(f, ranges):
+        """Yields the decoded text of each (start, end) byte range of an open log file."""
+        if os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                mapped = None # Some network and FUSE filesystems cannot be mapped; read instead
+            if mapped is not None:
+                with mapped:
+                    for start, end in ranges:
+                        # Decoding straight from the mapping skips the bytes copy read() would make
+                        with memoryview(mapped)[start:end] as view:
+                            text = str(view, 'utf-8', 'replace')
+                        yield text
+                return
+        for start, end in ranges:
+            f.seek(start)
+            yield (f.read(end - start) if end is not None else f.read()).decode('utf-8', 'replace')
+    def get_log_tail(self, date_str, tail, before=None):
+        """
+        Returns (text, offset) for roughly the last `tail` lines of a day that start before
+        byte `before` (default: the end of the file). Pass the offset back in to page further
+        up the day; it is None once the first line of the day has been returned.
+        """
+        self.flush()
+        with self._lock:
+            runs = list(self._date_runs)
+        try: size = os.path.getsize(self.log_file)
+        except OSError: return "", None
+        if before is None: before = size
+        # Byte ranges that belong to this day, cut off at `before`
+        ranges = [(start, min(runs[i + 1][1] if i + 1 < len(runs) else size, before))
+                  for i, (run_date, start) in enumerate(runs) if run_date == date_str and start < before]
+        if not ranges: return "", None
+
+        blocks, newlines, pos = [], 0, ranges[-1][1]
+        try:
+            with open(self.log_file, 'rb') as f:
+                # Read backwards block by block instead of loading the whole day
+                for start, end in reversed(ranges):
+                    pos = end
+                    while pos > start and newlines <= tail:
+                        step = min(self._TAIL_BLOCK, pos - start)
+                        pos -= step
+                        f.seek(pos)
+                        block = f.read(step)
+                        newlines += block.count(b"\n")
+                        blocks.append(block)
+                    if newlines > tail: break
+        except FileNotFoundError: return "", None
+
+        data = b"".join(reversed(blocks))
+        if all(pos != start for start, _ in ranges):
+            # The first block began mid-line; leave that line for the next page
+            cut = data.find(b"\n") + 1
+            data, pos = data[cut:], pos + cut
+        lines = [line.strip() for line in data.decode('utf-8', 'replace').splitlines() if line.startswith(date_str)]
+        return "\n".join(lines), (None if pos == ranges[0][0] else pos)
 
 class HashManager:
     def __init__(self, db_path, logger):
@@ -218,8 +554,12 @@ class HashManager:
             self.connection.commit()
             self.connection.close()
     def _setup_database(self):
+        # WAL + NORMAL: the batch of cache writes a scan makes commits without an fsync per page
+        self.cursor.execute("PRAGMA journal_mode=WAL")
+        self.cursor.execute("PRAGMA synchronous=NORMAL")
         self.cursor.execute("CREATE TABLE IF NOT EXISTS hash_cache (file_path TEXT PRIMARY KEY, mtime REAL NOT NULL, size INTEGER NOT NULL, file_hash TEXT NOT NULL, last_checked REAL NOT NULL)")
-        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_file_path ON hash_cache (file_path)")
+        # The primary key is already indexed; a second index on it only doubled every write
+        self.cursor.execute("DROP INDEX IF EXISTS idx_file_path")
     def get_cached_hash(self, file_path, mtime, size):
         self.cursor.execute("SELECT mtime, size, file_hash FROM hash_cache WHERE file_path = ?", (file_path,))
         result = self.cursor.fetchone()
@@ -241,20 +581,7 @@ class HashManager:
         return len(paths_to_delete)
 
 # --- CUSTOM UI WIDGETS ---
-class ActionWidget(QWidget):
-    keep_requested = pyqtSignal()
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(5, 0, 5, 0)
-        layout.setSpacing(5)
-        style = self.style()
-        self.keep_button = QPushButton(style.standardIcon(QStyle.StandardPixmap.SP_DialogApplyButton), "")
-        self.keep_button.setToolTip("保留这个文件，并清理此组中的其他文件。")
-        self.keep_button.setCheckable(True)
-        self.keep_button.setChecked(False)
-        self.keep_button.toggled.connect(lambda checked: self.keep_requested.emit() if checked else None)
-        layout.addWidget(self.keep_button)
+DROP_FRAME_ICON_SIZE = 64 # Category icon size in the drop frames
 
 class DropFrame(QFrame):
     def __init__(self, category_name, icon, main_window):
@@ -317,22 +644,670 @@ class ThemedTreeView(DropTreeView):
     def __init__(self, main_window):
         super().__init__(main_window)
         self.background_text = ""
+        self._bg_pixmap = None # The background text rendered once for the current viewport size
     def setBackgroundText(self, text):
         if self.background_text != text:
             self.background_text = text
+            self._bg_pixmap = None
             self.viewport().update()
+    def resizeEvent(self, event):
+        self._bg_pixmap = None
+        super().resizeEvent(event)
+    def _render_background(self):
+        # Laying out 120pt text is costly, so it is drawn once here and blitted on every repaint
+        ratio = self.viewport().devicePixelRatioF()
+        size = self.viewport().size()
+        pixmap = QPixmap(round(size.width() * ratio), round(size.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        painter.setFont(QFont("Segoe UI", 120, QFont.Weight.ExtraBold))
+        painter.setPen(QColor(200, 200, 200, 15))
+        painter.drawText(QRect(0, 0, size.width(), size.height()), Qt.AlignmentFlag.AlignCenter, self.background_text)
+        painter.end()
+        return pixmap
     def paintEvent(self, event):
         super().paintEvent(event)
         if self.background_text:
+            if self._bg_pixmap is None:
+                self._bg_pixmap = self._render_background()
             painter = QPainter(self.viewport())
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-            font = QFont("Segoe UI", 120, QFont.Weight.ExtraBold)
-            painter.setFont(font)
-            painter.setPen(QColor(200, 200, 200, 15))
-            painter.drawText(self.viewport().rect(), Qt.AlignmentFlag.AlignCenter, self.background_text)
+            painter.drawPixmap(0, 0, self._bg_pixmap)
             painter.end()
 
 
+class _FsNode:
+    """
+    One row of the LazyFileSystemModel. `children` stays None until the folder is expanded.
+    `row` is the node's position in parent.children, kept current by the model.
+    """
+    __slots__ = ("name", "path", "is_dir", "entry", "parent", "children", "row")
+
+    def __init__(self, name, path, is_dir, entry=None, parent=None):
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.entry = entry
+        self.parent = parent
+        self.children = None
+        self.row = 0
+
+
+class LazyFileSystemModel(QAbstractItemModel):
+    """
+    Drop-in replacement for the QFileSystemModel used by the main tree view.
+    Folders are listed with os.scandir only when they are expanded, and the
+    extra stat() for size/date is only done if one of those columns is shown.
+    Exposes the small part of the QFileSystemModel API the app relies on:
+    setRootPath(), index(path), filePath(), isDir().
+    """
+    HEADERS = ["Name", "Size", "Type", "Date Modified"]
+    FILE_ATTRIBUTE_HIDDEN = 0x2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root = None
+        self._dir_cache = {} # {dir_path: (mtime_ns, [DirEntry, ...])}
+        self._icon_provider = QFileIconProvider()
+        self._folder_icon = self._icon_provider.icon(QFileIconProvider.IconType.Folder)
+        self._file_icons = {} # {extension: QIcon}
+        self._sort_column = 0
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    # --- QFileSystemModel-compatible helpers ---
+    def setRootPath(self, path):
+        self.beginResetModel()
+        if path:
+            path = os.path.normpath(path)
+            self._root = _FsNode(os.path.basename(path), path, True)
+        else:
+            self._root = None
+        self.endResetModel()
+
+    def rootPath(self):
+        return self._root.path if self._root else ""
+
+    def filePath(self, index):
+        node = self._node(index)
+        return node.path if node and node is not self._root else ""
+
+    def isDir(self, index):
+        node = self._node(index)
+        return bool(node and node.is_dir)
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        if isinstance(row, str):
+            return self._index_for_path(row)
+        parent_node = self._node(parent)
+        if not parent_node or parent_node.children is None or not (0 <= row < len(parent_node.children)):
+            return QModelIndex()
+        if not (0 <= column < len(self.HEADERS)):
+            return QModelIndex()
+        return self.createIndex(row, column, parent_node.children[row])
+
+    def _index_for_path(self, path):
+        """Resolves a filesystem path to an index, loading intermediate folders on demand."""
+        if not self._root or not path:
+            return QModelIndex()
+        rel = os.path.relpath(os.path.normpath(path), self._root.path)
+        if rel == os.curdir or rel.startswith(os.pardir):
+            return QModelIndex()
+        node = self._root
+        for part in rel.split(os.sep):
+            if node.children is None:
+                self._populate(node)
+            row = next((i for i, child in enumerate(node.children) if child.name == part), -1)
+            if row < 0:
+                return QModelIndex()
+            node = node.children[row]
+        return self.createIndex(row, 0, node)
+
+    def _node(self, index):
+        if index.isValid():
+            return index.internalPointer()
+        return self._root
+
+    def _index_of_node(self, node):
+        if node is None or node is self._root or node.parent is None:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    # --- Directory loading ---
+    def _scan(self, dir_path):
+        """Returns the visible DirEntry list for dir_path, reusing the cached listing if the folder's mtime is unchanged."""
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            self._dir_cache.pop(dir_path, None)
+            return []
+        cached = self._dir_cache.get(dir_path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        entries = []
+        try:
+            with os.scandir(dir_path) as it:
+                entries = [entry for entry in it if self._is_visible(entry)]
+        except OSError:
+            pass
+        self._dir_cache[dir_path] = (mtime_ns, entries)
+        return entries
+
+    @classmethod
+    def _is_visible(cls, entry):
+        """Hides dotfiles everywhere and hidden-attribute files on Windows, like QDir's default filter."""
+        if entry.name.startswith('.'):
+            return False
+        if sys.platform == "win32":
+            # On Windows the attributes come for free with the directory listing
+            attrs = getattr(entry.stat(follow_symlinks=False), "st_file_attributes", 0)
+            if attrs & cls.FILE_ATTRIBUTE_HIDDEN:
+                return False
+        return True
+
+    def _make_children(self, node):
+        children = []
+        for entry in self._scan(node.path):
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            children.append(_FsNode(entry.name, os.path.join(node.path, entry.name), is_dir, entry, node))
+        children.sort(key=self._sort_key, reverse=(self._sort_order == Qt.SortOrder.DescendingOrder))
+        self._renumber(children)
+        return children
+
+    @staticmethod
+    def _renumber(children, start=0):
+        """Stores each node's row from `start` on, after the list was sorted or changed there."""
+        for row in range(start, len(children)):
+            children[row].row = row
+
+    def _populate(self, node):
+        node.children = self._make_children(node)
+
+    def invalidate(self, dir_path):
+        """Drops the cached listing of a folder (called from the file watcher)."""
+        self._dir_cache.pop(os.path.normpath(dir_path), None)
+
+    def refresh_directory(self, dir_path):
+        """Re-lists a loaded folder and applies only the rows that were added or removed."""
+        dir_path = os.path.normpath(dir_path)
+        self.invalidate(dir_path)
+        if not self._root:
+            return
+        if dir_path == self._root.path:
+            node = self._root
+        else:
+            index = self._index_for_path(dir_path) if self._is_loaded_path(dir_path) else QModelIndex()
+            if not index.isValid():
+                return
+            node = index.internalPointer()
+        if node.children is None:
+            return
+
+        parent_index = self._index_of_node(node)
+        fresh = {child.name: child for child in self._make_children(node)}
+        for row in range(len(node.children) - 1, -1, -1):
+            if node.children[row].name not in fresh:
+                self.beginRemoveRows(parent_index, row, row)
+                del node.children[row]
+                self._renumber(node.children, row)
+                self.endRemoveRows()
+
+        existing = {child.name for child in node.children}
+        reverse = (self._sort_order == Qt.SortOrder.DescendingOrder)
+        for name, child in fresh.items():
+            if name in existing:
+                continue
+            key = self._sort_key(child)
+            row = next((i for i, c in enumerate(node.children) if (self._sort_key(c) > key) != reverse), len(node.children))
+            self.beginInsertRows(parent_index, row, row)
+            node.children.insert(row, child)
+            self._renumber(node.children, row)
+            self.endInsertRows()
+
+    def refresh_loaded(self):
+        """Refreshes every folder that has been expanded so far."""
+        if not self._root or self._root.children is None:
+            return
+        stack, loaded = [self._root], []
+        while stack:
+            node = stack.pop()
+            loaded.append(node.path)
+            stack.extend(c for c in node.children if c.is_dir and c.children is not None)
+        for path in loaded:
+            self.refresh_directory(path)
+
+    def _is_loaded_path(self, path):
+        """True if every folder between the root and `path` has already been listed."""
+        rel = os.path.relpath(path, self._root.path)
+        if rel.startswith(os.pardir):
+            return False
+        node = self._root
+        for part in rel.split(os.sep)[:-1]:
+            if node.children is None:
+                return False
+            node = next((c for c in node.children if c.name == part), None)
+            if node is None:
+                return False
+        return node.children is not None
+
+    # --- QAbstractItemModel interface ---
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        return self._index_of_node(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        node = self._node(parent)
+        return len(node.children) if node and node.children is not None else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self._node(parent)
+        if not node or not node.is_dir:
+            return False
+        return node.children is None or bool(node.children)
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        return bool(node and node.is_dir and node.children is None)
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        if not node or node.children is not None:
+            return
+        children = self._make_children(node)
+        if not children:
+            node.children = []
+            return
+        self.beginInsertRows(parent, 0, len(children) - 1)
+        node.children = children
+        self.endInsertRows()
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.ItemIsDropEnabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsDropEnabled
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return node.name
+            if column == 2:
+                return "Folder" if node.is_dir else (os.path.splitext(node.name)[1][1:].upper() + " File").strip()
+            # Size/Date columns are hidden in the main window; only stat() when they are actually shown.
+            st = self._stat(node)
+            if st is None:
+                return ""
+            if column == 1:
+                return "" if node.is_dir else format_size(st.st_size)
+            if column == 3:
+                return datetime.fromtimestamp(st.st_mtime).strftime('%Y-%m-%d %H:%M')
+        elif role == Qt.ItemDataRole.DecorationRole and column == 0:
+            return self._icon_for(node)
+        elif role == Qt.ItemDataRole.ToolTipRole and column == 0:
+            return node.path
+        return None
+
+    def _stat(self, node):
+        try:
+            return node.entry.stat() if node.entry else os.stat(node.path)
+        except OSError:
+            return None
+
+    def _icon_for(self, node):
+        if node.is_dir:
+            return self._folder_icon
+        ext = os.path.splitext(node.name)[1].lower()
+        icon = self._file_icons.get(ext)
+        if icon is None:
+            icon = self._icon_provider.icon(QFileInfo(node.path))
+            self._file_icons[ext] = icon
+        return icon
+
+    def _sort_key(self, node):
+        # Folders always come first, like the Explorer/QFileSystemModel ordering
+        if self._sort_column in (1, 3) and not node.is_dir:
+            st = self._stat(node)
+            value = (st.st_size if self._sort_column == 1 else st.st_mtime) if st else 0
+            return (not node.is_dir, value, node.name.lower())
+        if self._sort_column == 2:
+            return (not node.is_dir, os.path.splitext(node.name)[1].lower(), node.name.lower())
+        return (not node.is_dir, node.name.lower())
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sort_column, self._sort_order = column, order
+        if not self._root or self._root.children is None:
+            return
+        self.layoutAboutToBeChanged.emit()
+        old_persistent = self.persistentIndexList()
+        persistent_nodes = [(idx.internalPointer(), idx.column()) for idx in old_persistent]
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            node.children.sort(key=self._sort_key, reverse=(order == Qt.SortOrder.DescendingOrder))
+            self._renumber(node.children)
+            stack.extend(c for c in node.children if c.children)
+        new_persistent = [self.createIndex(node.row, column, node) for node, column in persistent_nodes]
+        self.changePersistentIndexList(old_persistent, new_persistent)
+        self.layoutChanged.emit()
+
+
+class CheckableFileSystemModel(LazyFileSystemModel):
+    """
+    LazyFileSystemModel with a checkbox on every row. Everything starts checked and
+    only the user's explicit choices are stored, as {path: checked}; every other row
+    inherits the choice of its nearest ancestor. Nothing is listed to (un)check a
+    folder, so the cost follows what is visible rather than the size of the tree.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._choices = {}
+        # {folder: [unchecked, checked]} counts of the choices strictly below each folder
+        self._below_counts = {}
+
+    def _count_choice(self, path, checked, delta):
+        """Adds delta to the counters of every folder above path, up to the root."""
+        root = self._root.path
+        while path != root and (parent := os.path.dirname(path)) != path:
+            path = parent
+            self._below_counts.setdefault(path, [0, 0])[checked] += delta
+
+    def _inherited_state(self, path):
+        """The checked flag of path, taken from the closest choice on the way up to the root."""
+        root = self._root.path
+        while True:
+            if path in self._choices:
+                return self._choices[path]
+            if path == root:
+                return True
+            parent = os.path.dirname(path)
+            if parent == path:
+                return True
+            path = parent
+
+    def check_state(self, path):
+        checked = self._inherited_state(path)
+        # A folder is partial when some choice inside it disagrees with its own state
+        if (counts := self._below_counts.get(path)) and counts[not checked]:
+            return Qt.CheckState.PartiallyChecked
+        return Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+
+    def set_checked(self, path, checked, node=None):
+        # Choices below path are overridden by the new one
+        prefix = path + os.sep
+        if any(self._below_counts.get(path, ())):
+            for p in [p for p in self._choices if p.startswith(prefix)]:
+                self._count_choice(p, self._choices.pop(p), -1)
+        if path in self._choices:
+            self._count_choice(path, self._choices[path], -1)
+        self._choices[path] = checked
+        self._count_choice(path, checked, 1)
+        self._emit_check_states(node)
+
+    def set_all_checked(self, checked):
+        if not self._root: return
+        self._choices = {self._root.path: checked}
+        self._below_counts = {}
+        self._emit_check_states()
+
+    def _emit_check_states(self, node=None):
+        """
+        Repaints checkboxes. For a clicked node only its ancestors (whose partial state may
+        flip), itself and its loaded subtree change; without one, every loaded row is repainted.
+        """
+        if not self._root or self._root.children is None:
+            return
+        if node is None:
+            node = self._root
+        else:
+            row_node = node
+            while row_node is not None and row_node is not self._root:
+                index = self._index_of_node(row_node)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+                row_node = row_node.parent
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.children:
+                parent_index = self._index_of_node(node)
+                self.dataChanged.emit(self.index(0, 0, parent_index), self.index(len(node.children) - 1, 0, parent_index),
+                                      [Qt.ItemDataRole.CheckStateRole])
+                stack.extend(c for c in node.children if c.children)
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() == 0:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.CheckStateRole and index.isValid() and index.column() == 0:
+            return self.check_state(index.internalPointer().path)
+        return super().data(index, role)
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.CheckStateRole or not index.isValid() or index.column() != 0:
+            return False
+        node = index.internalPointer()
+        self.set_checked(node.path, Qt.CheckState(value) != Qt.CheckState.Unchecked, node)
+        return True
+
+    def checked_selection(self):
+        """A snapshot of the choices as (root, {path: checked}), for list_checked_files in a worker."""
+        return (self._root.path if self._root else None), dict(self._choices)
+
+    @classmethod
+    def list_checked_files(cls, root, choices):
+        """
+        Lists every checked file on disk. Unchecked folders are not entered unless
+        a checked choice lies somewhere inside them. Walks the disk, so it is meant
+        to run off the GUI thread on a checked_selection() snapshot.
+        """
+        if not root:
+            return []
+        # Unchecked folders that still have to be walked to reach a checked choice
+        must_walk = set()
+        for path, checked in choices.items():
+            while checked and path != root and path not in must_walk:
+                must_walk.add(path)
+                path = os.path.dirname(path)
+
+        files = []
+        stack = [(root, choices.get(root, True))]
+        while stack:
+            dir_path, checked = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = [entry for entry in it if cls._is_visible(entry)]
+            except OSError:
+                continue
+            for entry in entries:
+                entry_checked = choices.get(entry.path, checked)
+                try:
+                    is_dir = entry.is_dir()
+                    if is_dir and entry.is_symlink(): continue # Never follow folder links (loops)
+                except OSError:
+                    continue
+                if is_dir:
+                    if entry_checked or entry.path in must_walk:
+                        stack.append((entry.path, entry_checked))
+                elif entry_checked:
+                    files.append(entry.path)
+        return files
+
+
+class SearchResultsModel(QAbstractListModel):
+    """
+    Holds the current page of search results for the QListView. Rows are painted
+    by SearchResultDelegate, so no widgets are created per result.
+    """
+    RecordRole = Qt.ItemDataRole.UserRole + 1 # The index record dict
+    DisplayInfoRole = Qt.ItemDataRole.UserRole + 2 # (name, category, path_text, size_text, mtime_text)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []
+        self._display_cache = {}
+        self._base_dir = ""
+        self._folder_to_category = {}
+
+    def set_results(self, items, base_dir, folder_to_category):
+        self.beginResetModel()
+        self._items = list(items)
+        self._display_cache = {}
+        self._base_dir = base_dir or ""
+        self._folder_to_category = folder_to_category
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._items)):
+            return None
+        item = self._items[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return os.path.basename(item["path"])
+        if role in (Qt.ItemDataRole.UserRole, Qt.ItemDataRole.ToolTipRole):
+            return item["path"]
+        if role == self.RecordRole:
+            return item
+        if role == self.DisplayInfoRole:
+            info = self._display_cache.get(index.row())
+            if info is None:
+                info = self._display_cache[index.row()] = self._describe(item)
+            return info
+        return None
+
+    def _describe(self, item):
+        """Pre-formats the strings the delegate draws for one result."""
+        path = item["path"]
+        try:
+            rel_path = os.path.relpath(os.path.dirname(path), self._base_dir)
+        except ValueError:
+            # Different drives on Windows: show the absolute directory
+            rel_path = os.path.dirname(path)
+        path_parts = rel_path.split(os.sep)
+        category_name = self._folder_to_category.get(path_parts[0])
+        if category_name:
+            path_text = os.path.join(*path_parts[1:]) if len(path_parts) > 1 else ""
+        else:
+            path_text = rel_path
+        return (
+            os.path.basename(path),
+            category_name,
+            path_text.replace(os.sep, "  ▶  "),
+            format_size(item["size"]),
+            f"Modified: {datetime.fromtimestamp(item['mtime']).strftime('%Y-%m-%d %H:%M')}",
+        )
+
+
+class SearchResultDelegate(QStyledItemDelegate):
+    """Paints a search result row: file icon, name, category + path, and size/date."""
+    ROW_HEIGHT = 64
+    META_WIDTH = 160
+    CATEGORY_ICON_SIZE = 20
+
+    def __init__(self, main_window, parent=None):
+        super().__init__(parent)
+        self.main_window = main_window
+        self._icon_provider = QFileIconProvider()
+        self._file_icons = {} # {extension: QIcon}
+        self.name_font = QFont()
+        self.name_font.setPointSize(12)
+        self.name_font.setBold(True)
+        self.path_font = QFont()
+        self.path_font.setPointSize(9)
+        self.name_metrics = QFontMetrics(self.name_font)
+        self.path_metrics = QFontMetrics(self.path_font)
+        self.text_color = QColor("#abb2bf")
+        self.selected_text_color = QColor("#ffffff")
+        self.date_color = QColor("#98c379")
+        self.path_color = QColor("#82c0ff")
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def _file_icon(self, path):
+        ext = os.path.splitext(path)[1].lower()
+        icon = self._file_icons.get(ext)
+        if icon is None:
+            icon = self._file_icons[ext] = self._icon_provider.icon(QFileInfo(path))
+        return icon
+
+    def paint(self, painter, option, index):
+        info = index.data(SearchResultsModel.DisplayInfoRole)
+        if not info:
+            return super().paint(painter, option, index)
+        name, category_name, path_text, size_text, mtime_text = info
+
+        # Let the style sheet draw the hover/selection background, then draw the content ourselves
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        opt.icon = QIcon()
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, widget)
+
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        rect = option.rect.adjusted(8, 8, -8, -8)
+        painter.save()
+
+        self._file_icon(index.data(Qt.ItemDataRole.UserRole)).paint(
+            painter, QRect(rect.left(), rect.center().y() - 16, 32, 32))
+
+        meta_rect = QRect(rect.right() - self.META_WIDTH, rect.top(), self.META_WIDTH, rect.height())
+        painter.setFont(self.path_font)
+        painter.setPen(self.text_color)
+        painter.drawText(meta_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop, size_text)
+        painter.setPen(self.date_color)
+        painter.drawText(meta_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignBottom, mtime_text)
+
+        text_left = rect.left() + 32 + 12
+        text_width = meta_rect.left() - 12 - text_left
+        half = rect.height() // 2
+        painter.setFont(self.name_font)
+        painter.setPen(self.selected_text_color if selected else self.text_color)
+        name_rect = QRect(text_left, rect.top(), text_width, half)
+        painter.drawText(name_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         self.name_metrics.elidedText(name, Qt.TextElideMode.ElideMiddle, text_width))
+
+        path_left = text_left
+        size = self.CATEGORY_ICON_SIZE
+        category_pixmaps = self.main_window.para_category_pixmaps.get(category_name) if category_name else None
+        painter.setFont(self.path_font)
+        if category_pixmaps:
+            painter.drawPixmap(QRect(path_left, rect.top() + half + (half - size) // 2, size, size), category_pixmaps[size])
+            path_left += size + 5
+            painter.setPen(self.text_color)
+            painter.drawText(QRect(path_left, rect.top() + half, 16, half), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, "▶")
+            path_left += 16 + 5
+        else:
+            path_text = path_text or "."
+        painter.setPen(self.text_color if selected else self.path_color)
+        path_width = text_left + text_width - path_left
+        painter.drawText(QRect(path_left, rect.top() + half, path_width, half), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         self.path_metrics.elidedText(path_text, Qt.TextElideMode.ElideMiddle, path_width))
+        painter.restore()
+
+
 
 
 
@@ -346,7 +1321,6 @@ class MoveToDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Move Items To...")
         self.setMinimumSize(550, 600)
-        self.setStyleSheet(parent.styleSheet())
         self.destination_path = None
         self.history = history
 
@@ -653,7 +1627,6 @@ class PreOperationDialog(QDialog):
     def __init__(self, dest_folder_name, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Action Required")
-        self.setStyleSheet(parent.styleSheet())
         self.setModal(True) # Ensures user must interact with it
         self.result = "cancel" # Default result if the dialog is closed
 
@@ -681,13 +1654,13 @@ class PreOperationDialog(QDialog):
             "Smart Scan (Recommended)",
             "Scans file content to prevent adding identical files. Slower but safer.",
             "scan",
-            self.style().standardIcon(QStyle.StandardPixmap.SP_FileDialogDetailedView)
+            standard_icon(QStyle.StandardPixmap.SP_FileDialogDetailedView)
         )
         self.skip_button = self._create_option_button(
             "Move All (Fast)",
             "Moves all files, automatically renaming any with the same name. Much faster, but may create duplicates.",
             "skip",
-            self.style().standardIcon(QStyle.StandardPixmap.SP_ArrowRight)
+            standard_icon(QStyle.StandardPixmap.SP_ArrowRight)
         )
 
         button_layout.addWidget(self.scan_button)
@@ -714,7 +1687,6 @@ class MoveConfirmationDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Confirm Move")
         self.setMinimumSize(700, 500)
-        self.setStyleSheet(parent.styleSheet())
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(15, 15, 15, 15)
@@ -785,6 +1757,7 @@ class MoveConfirmationDialog(QDialog):
         self.accept()
 class IconPickerDialog(QDialog):
     """A dialog that displays a grid of selectable QStyle standard icons."""
+    _icon_cache = None # [(name, QIcon)] of the non-null standard icons, shared by every instance
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Choose a Built-in Icon")
@@ -824,22 +1797,24 @@ class IconPickerDialog(QDialog):
         Populates the list with ALL available standard icons from QStyle,
         filtering out any that are null or cannot be rendered.
         """
-        style = self.style()
         self.icon_list_widget.clear() # Clear any previous items
 
-        # Iterate through every member of the QStyle.StandardPixmap enum
-        for enum_member in QStyle.StandardPixmap:
+        # The style's icon set does not change at runtime, so query it only on the first open
+        if IconPickerDialog._icon_cache is None:
+            style = self.style()
+            icons = ((enum_member.name, style.standardIcon(enum_member)) for enum_member in QStyle.StandardPixmap)
             # Important Check: Some enums might not have a valid icon in the current
             # OS style. We check if the icon is null to avoid showing blank squares.
-            icon = style.standardIcon(enum_member)
-            if not icon.isNull():
-                icon_name = enum_member.name  # e.g., "SP_DirIcon"
-                
-                # Create the list item with the icon and its identifier name
-                item = QListWidgetItem(icon, icon_name)
-                item.setData(Qt.ItemDataRole.UserRole, icon_name) # Store the name for retrieval
-                item.setToolTip(icon_name) # Show the name on hover
-                self.icon_list_widget.addItem(item)
+            IconPickerDialog._icon_cache = [(name, icon) for name, icon in icons if not icon.isNull()]
+
+        self.icon_list_widget.setUpdatesEnabled(False)
+        for icon_name, icon in IconPickerDialog._icon_cache: # icon_name e.g. "SP_DirIcon"
+            # Create the list item with the icon and its identifier name
+            item = QListWidgetItem(icon, icon_name)
+            item.setData(Qt.ItemDataRole.UserRole, icon_name) # Store the name for retrieval
+            item.setToolTip(icon_name) # Show the name on hover
+            self.icon_list_widget.addItem(item)
+        self.icon_list_widget.setUpdatesEnabled(True)
 
 
             
@@ -855,7 +1830,6 @@ class FolderDropDialog(QDialog):
     def __init__(self, folder_count, file_count, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Folder Drop Options")
-        self.setStyleSheet(parent.styleSheet())
         self.setMinimumWidth(850)  # <-- Set a wider minimum width
         self.result = "cancel"
 
@@ -908,7 +1882,7 @@ class FolderDropDialog(QDialog):
 
     def _create_option_button(self, title, description, result_val, icon):
         button = QPushButton(f" {title}")
-        button.setIcon(self.style().standardIcon(icon))
+        button.setIcon(standard_icon(icon))
         button.setToolTip(description)
         button.clicked.connect(lambda: self.set_result_and_accept(result_val))
         return button
@@ -925,7 +1899,6 @@ class AboutDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("About")
         self.setMinimumSize(700, 550)
-        self.setStyleSheet(parent.styleSheet())
 
         layout = QVBoxLayout(self)
         
@@ -962,26 +1935,20 @@ class HashingSelectionDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Select Scope for Duplicate Check")
         self.setMinimumSize(800, 600)
-        self.setStyleSheet(parent.styleSheet())
         layout = QVBoxLayout(self)
         layout.addWidget(QLabel("<b>Select items in the destination to include in the content check.</b>"))
         layout.addWidget(QLabel("Uncheck items to exclude them. Parent/child selections are linked."))
 
-        self.model = QFileSystemModel()
-        self.model.setFilter(QDir.Filter.AllEntries | QDir.Filter.NoDotAndDotDot)
+        # Check states are kept per path in the model, so folders are only listed when expanded
+        self.model = CheckableFileSystemModel(self)
         self.model.setRootPath(root_path)
-        self.model.setReadOnly(False)
 
         self.tree = QTreeView()
         self.tree.setModel(self.model)
-        self.tree.setRootIndex(self.model.index(root_path))
+        self.tree.setRootIndex(QModelIndex()) # The model's invisible root is root_path itself
         self.tree.header().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.tree.setColumnHidden(1, True); self.tree.setColumnHidden(2, True); self.tree.setColumnHidden(3, True)
-        
-        self._block_signals = False
-        self.set_check_state_recursive(self.model.index(0, 0, self.tree.rootIndex()), Qt.CheckState.Checked)
-        self.tree.expand(self.tree.rootIndex())
-        self.model.dataChanged.connect(self.on_data_changed)
+        for i in range(1, self.model.columnCount()):
+            self.tree.hideColumn(i)
         layout.addWidget(self.tree)
 
         button_layout = QHBoxLayout()
@@ -995,29 +1962,16 @@ class HashingSelectionDialog(QDialog):
 
         ok_button.clicked.connect(self.accept); cancel_button.clicked.connect(self.reject)
         
-        # --- FIX: Connect to new wrapper methods that block signals for performance ---
         check_all_btn.clicked.connect(self.check_all_items)
         uncheck_all_btn.clicked.connect(self.uncheck_all_items)
 
     def check_all_items(self):
-        """Checks all items, blocking signals for performance."""
-        self.model.blockSignals(True)
-        self.set_check_state_recursive(self.tree.rootIndex(), Qt.CheckState.Checked)
-        self.model.blockSignals(False)
-        # Emit a single dataChanged signal for the root to notify the view of a major change
-        root_index = self.tree.rootIndex()
-        self.model.dataChanged.emit(root_index, root_index, [])
-        self.tree.viewport().update()
+        """Checks all items with a single root-level choice."""
+        self.model.set_all_checked(True)
 
     def uncheck_all_items(self):
-        """Unchecks all items, blocking signals for performance."""
-        self.model.blockSignals(True)
-        self.set_check_state_recursive(self.tree.rootIndex(), Qt.CheckState.Unchecked)
-        self.model.blockSignals(False)
-        # Emit a single dataChanged signal for the root to notify the view of a major change
-        root_index = self.tree.rootIndex()
-        self.model.dataChanged.emit(root_index, root_index, [])
-        self.tree.viewport().update()
+        """Unchecks all items with a single root-level choice."""
+        self.model.set_all_checked(False)
     
     
 
@@ -1028,50 +1982,8 @@ class HashingSelectionDialog(QDialog):
     #     # 现在可以安全地调用 handle_search 来刷新UI了
     #     self.handle_search(self.search_bar.text())
     
-    def on_data_changed(self, topLeft, bottomRight, roles):
-        if Qt.ItemDataRole.CheckStateRole in roles and not self._block_signals:
-            self._block_signals = True
-            state = self.model.data(topLeft, Qt.ItemDataRole.CheckStateRole)
-            if self.model.hasChildren(topLeft):
-                self.set_check_state_recursive(topLeft, state, set_parent=False)
-            self.update_parent_states(topLeft.parent())
-            self._block_signals = False
-            
-    def set_check_state_recursive(self, parent_index, state, set_parent=True):
-        if not parent_index.isValid(): return
-        if set_parent:
-             self.model.setData(parent_index, state, Qt.ItemDataRole.CheckStateRole)
-        for i in range(self.model.rowCount(parent_index)):
-            child_index = self.model.index(i, 0, parent_index)
-            self.set_check_state_recursive(child_index, state)
-
-    def update_parent_states(self, parent_index):
-        if not parent_index.isValid(): return
-        checked_count, partially_checked_count, total_count = 0, 0, self.model.rowCount(parent_index)
-        for i in range(total_count):
-            state = self.model.data(self.model.index(i, 0, parent_index), Qt.ItemDataRole.CheckStateRole)
-            if state == Qt.CheckState.Checked: checked_count += 1
-            elif state == Qt.CheckState.PartiallyChecked: partially_checked_count += 1
-        new_state = Qt.CheckState.Unchecked
-        if checked_count == total_count: new_state = Qt.CheckState.Checked
-        elif checked_count > 0 or partially_checked_count > 0: new_state = Qt.CheckState.PartiallyChecked
-        self.model.setData(parent_index, new_state, Qt.ItemDataRole.CheckStateRole)
-        self.update_parent_states(parent_index.parent())
-
-    def get_checked_files(self):
-        checked_files = []
-        self._get_checked_recursive(self.tree.rootIndex(), checked_files)
-        return checked_files
-
-    def _get_checked_recursive(self, index, checked_list):
-        if not index.isValid(): return
-        if self.model.data(index, Qt.ItemDataRole.CheckStateRole) != Qt.CheckState.Unchecked:
-            path = self.model.filePath(index)
-            if os.path.isfile(path):
-                checked_list.append(path)
-            elif os.path.isdir(path) and self.model.hasChildren(index):
-                 for i in range(self.model.rowCount(index)):
-                    self._get_checked_recursive(self.model.index(i, 0, index), checked_list)
+    def get_checked_selection(self):
+        return self.model.checked_selection()
 
 # --- REPLACE your entire DeduplicationDialog class with this one ---
 
@@ -1081,7 +1993,6 @@ class DeduplicationDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Duplicate Files Found")
         self.setMinimumSize(1200, 600)
-        self.setStyleSheet(parent.styleSheet())
         self.duplicates = duplicates
         
         layout = QVBoxLayout(self)
@@ -1096,10 +2007,14 @@ class DeduplicationDialog(QDialog):
         self.table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.show_table_context_menu)
         
+        header = self.table.horizontalHeader()
+        header.setResizeContentsPrecision(200) # Size columns from a sample of rows, not every row
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         self.populate_table()
-        self.table.resizeColumnsToContents()
-        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        # The path columns stretch, so only the action and size columns need measuring
+        self.table.resizeColumnToContents(0)
+        self.table.resizeColumnToContents(3)
         layout.addWidget(self.table)
         
         button_layout = QHBoxLayout()
@@ -1125,10 +2040,15 @@ class DeduplicationDialog(QDialog):
                     combo_box.setCurrentIndex(index)
 
     def populate_table(self):
+        # Bulk insert: no sorting, repaints or item signals until every row is in
+        sorting_enabled = self.table.isSortingEnabled()
+        self.table.setSortingEnabled(False)
+        self.table.setUpdatesEnabled(False)
+        self.table.blockSignals(True)
         self.table.setRowCount(len(self.duplicates))
         actions = ["Move to Recycle Bin", "Move to '_duplicates' folder", "Skip (Move and Rename)"]
         
-        for row, (old_path, _, _) in enumerate(self.duplicates):
+        for row, (old_path, dest_path, _, size) in enumerate(self.duplicates):
             combo_box = QComboBox()
             combo_box.addItems(actions)
             # Set a tooltip for the combo box itself
@@ -1138,14 +2058,15 @@ class DeduplicationDialog(QDialog):
                 "Skip: Moves the file anyway, creating a copy."
             )
             self.table.setCellWidget(row, 0, combo_box)
-            # ... (The rest of the table populating logic is the same as your last version)
-            try: old_stat = os.stat(old_path)
-            except FileNotFoundError: continue
-            self.table.setItem(row, 1, QTableWidgetItem(self.duplicates[row][0]))
-            self.table.setItem(row, 2, QTableWidgetItem(self.duplicates[row][1]))
-            formatted_size = format_size(old_stat.st_size)
+            # The scan already recorded each source's size, so no stat() per row
+            self.table.setItem(row, 1, QTableWidgetItem(old_path))
+            self.table.setItem(row, 2, QTableWidgetItem(dest_path))
+            formatted_size = format_size(size)
             size_item = QTableWidgetItem(formatted_size); size_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
             self.table.setItem(row, 3, size_item)
+        self.table.blockSignals(False)
+        self.table.setUpdatesEnabled(True)
+        self.table.setSortingEnabled(sorting_enabled)
 
     def get_user_choices(self):
         """Gets the user's chosen action from the combo box for each file."""
@@ -1161,33 +2082,67 @@ class DeduplicationDialog(QDialog):
         item = self.table.itemAt(pos)
         if not item or item.column() not in [1, 2]: return
         path = item.text()
-        menu = QMenu(); action = menu.addAction(self.style().standardIcon(QStyle.StandardPixmap.SP_DirIcon), "Show in File Explorer")
+        menu = QMenu(); action = menu.addAction(standard_icon(QStyle.StandardPixmap.SP_DirIcon), "Show in File Explorer")
         if menu.exec(self.table.mapToGlobal(pos)) == action:
             try:
                 if sys.platform == "win32": subprocess.run(['explorer', '/select,', os.path.normpath(path)])
                 else: subprocess.run(['open', '-R', os.path.normpath(path)])
             except Exception as e: self.parent().logger.error(f"Failed to show in explorer: {path}", exc_info=True)
 
-class LogViewerDialog(QDialog):
-
-    # --- In the LogViewerDialog class, REPLACE the __init__ method ---
+# Log viewer colours, keyed by the padded level field the Logger writes ("{level:<8}")
+LOG_COLOR_DEFAULT = "#abb2bf"
+LOG_LEVEL_COLORS = {"INFO    ": "#63a37b", "WARNING ": "#cda152", "ERROR   ": "#b85c5c"}
+LOG_COLOR_TIMESTAMP = "#6c7380"
+LOG_COLOR_BACKGROUND = "#21252b"
+LOG_PAGE_CACHE_SIZE = 8 # Dates kept in memory by the log viewer
+LOG_DATE_DEBOUNCE_MS = 150 # Scrolling through the date combo only loads the date it stops on
+LOG_TAIL_LINES = 1000 # Lines shown when a date is opened; older lines load on scrolling to the top
+
+class LogHighlighter(QSyntaxHighlighter):
+    """Colours the timestamp and level of each log line in the log viewer."""
+    # Formats never change, so they are built once and shared by every viewer
+    _timestamp_format = None
+    _level_formats = None
+    def __init__(self, document):
+        super().__init__(document)
+        if LogHighlighter._level_formats is None:
+            LogHighlighter._timestamp_format = self._format(LOG_COLOR_TIMESTAMP)
+            LogHighlighter._level_formats = {level: self._format(color) for level, color in LOG_LEVEL_COLORS.items()}
+
+    @staticmethod
+    def _format(color):
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor(color))
+        return fmt
+
+    def highlightBlock(self, text):
+        # Lines without a "timestamp [LEVEL   ]" prefix (tracebacks) keep the default text colour
+        if len(text) > 23 and text[19] == ' ' and text[20] == '[':
+            self.setFormat(0, 19, self._timestamp_format)
+            # The level sits in a fixed-width field right after the timestamp
+            if (fmt := self._level_formats.get(text[21:29])) is not None:
+                self.setFormat(19, len(text) - 19, fmt)
 
+class LogViewerDialog(QDialog):
     def __init__(self, logger, parent=None):
         super().__init__(parent)
         self.logger = logger
         self.setWindowTitle("Log Viewer")
         self.setMinimumSize(900, 700)
-        self.setStyleSheet(parent.styleSheet())
         
         layout = QVBoxLayout(self)
         controls_layout = QHBoxLayout()
         self.date_combo = QComboBox()
         controls_layout.addWidget(QLabel("Select Date:"))
         controls_layout.addWidget(self.date_combo)
+        self.status_label = QLabel("")
+        controls_layout.addWidget(self.status_label)
         controls_layout.addStretch()
         layout.addLayout(controls_layout)
         
-        self.log_display = QTextBrowser()
+        # Plain-text block layout is far cheaper than rich text for MB-sized logs
+        self.log_display = QPlainTextEdit()
+        self.log_display.setReadOnly(True)
         self.log_display.setFont(QFont("Consolas", 10))
         
         # --- THIS IS THE FIX ---
@@ -1195,79 +2150,136 @@ class LogViewerDialog(QDialog):
         palette = self.log_display.palette()
         # Set the 'Base' color role (the background for text-entry areas)
         # to our application's dark background color.
-        palette.setColor(QPalette.ColorRole.Base, QColor("#21252b"))
+        palette.setColor(QPalette.ColorRole.Base, QColor(LOG_COLOR_BACKGROUND))
+        palette.setColor(QPalette.ColorRole.Text, QColor(LOG_COLOR_DEFAULT))
         # Apply the new palette to the widget
         self.log_display.setPalette(palette)
         # --- END OF FIX ---
+        self.highlighter = LogHighlighter(self.log_display.document())
 
         layout.addWidget(self.log_display)
         
-        self.date_combo.currentIndexChanged.connect(self.load_log_for_date)
+        # {date: (stamp, log text, offset of older lines or None)}, least recently viewed first.
+        # The stamp is the log file's (mtime, size) for the newest date and None for finished days.
+        self._page_cache = OrderedDict()
+        self._shown_key = None # (date, stamp) of the page on screen
+        self._older_offset = None # Where the next page up starts for the date on screen
+        self._loading_older = False
+        self.log_display.verticalScrollBar().valueChanged.connect(self.on_log_scrolled)
+        self._dates = []
+        self._pending_date = None # Date the newest read was started for; older results are dropped
+        self._read_workers = set() # Keeps running readers alive until they finish
+        self._date_timer = QTimer(self)
+        self._date_timer.setSingleShot(True)
+        self._date_timer.setInterval(LOG_DATE_DEBOUNCE_MS)
+        self._date_timer.timeout.connect(self.load_log_for_date)
+        self.date_combo.currentIndexChanged.connect(lambda _: self._date_timer.start())
         self.populate_dates()
-    def populate_dates(self): self.date_combo.clear(); self.date_combo.addItems(self.logger.get_log_dates())
-    
-    # def load_log_for_date(self):
-    #     date_str = self.date_combo.currentText()
-    #     if not date_str: return
-    #     logs = self.logger.get_logs_for_date(date_str); html = ""
-    #     for line in logs.split('\n'):
-    #         line = line.replace("<", "&lt;").replace(">", "&gt;"); color = "#abb2bf"
-    #         if "[ERROR" in line: color = "#e06c75"
-    #         elif "[WARNING" in line: color = "#d19a66"
-    #         elif "[INFO" in line: color = "#98c379"
-    #         html += f'<pre style="margin: 0; padding: 0; white-space: pre-wrap; color: {color};">{line}</pre>'
-    #     self.log_display.setHtml(html)
-    
-    
-    # --- In the LogViewerDialog class, REPLACE the load_log_for_date method ---
 
+    def populate_dates(self):
+        dates = self.logger.get_log_dates()
+        if dates != self._dates: # New days were logged; drop pages that may be out of date
+            self._page_cache.clear()
+            self._dates = dates
+        self.date_combo.clear(); self.date_combo.addItems(dates)
+        # Show the newest day straight away rather than after the debounce delay
+        self._date_timer.stop()
+        self.load_log_for_date()
+    
     def load_log_for_date(self):
         date_str = self.date_combo.currentText()
         if not date_str:
-            self.log_display.setHtml("")
+            self._pending_date = self._shown_key = None
+            self.log_display.clear()
             return
 
-        logs = self.logger.get_logs_for_date(date_str)
-        
-        # This color palette no longer needs the background color
-        color_timestamp = "#6c7380"
-        color_default = "#abb2bf"
-        color_info = "#63a37b"
-        color_warn = "#cda152"
-        color_error = "#b85c5c"
-        
-        html_lines = []
-        for line in logs.split('\n'):
-            line = line.replace("<", "&lt;").replace(">", "&gt;")
-            
-            main_color = color_default
-            if "[ERROR" in line: main_color = color_error
-            elif "[WARNING" in line: main_color = color_warn
-            elif "[INFO" in line: main_color = color_info
-
-            # The <pre> style is now simpler
-            pre_style = 'style="margin: 0; padding: 2px 5px; white-space: pre-wrap;"'
-
-            if len(line) > 23 and line[19] == ' ' and '[' in line[20:29]:
-                timestamp = line[:19]
-                message = line[19:]
-                html_line = (
-                    f'<pre {pre_style}>'
-                    f'<span style="color: {color_timestamp};">{timestamp}</span>'
-                    f'<span style="color: {main_color};">{message}</span>'
-                    f'</pre>'
-                )
-                html_lines.append(html_line)
-            else:
-                html_lines.append(f'<pre {pre_style}><span style="color: {main_color};">{line}</span></pre>')
-
-        self.log_display.setHtml("".join(html_lines))
-        
+        # Older days never change; the newest one is only reused while the log file has not grown
+        stamp = self._log_stamp() if date_str == self.date_combo.itemText(0) else None
+        self._pending_date = date_str
+        if (date_str, stamp) == self._shown_key:
+            return # Already on screen and nothing new was logged
+        self._loading_older = False
+        if (page := self._page_cache.get(date_str)) is not None and page[0] == stamp:
+            self._page_cache.move_to_end(date_str)
+            self._show_logs(date_str, *page)
+            return
 
+        # Only the tail of the day is read up front; most visits are about the latest entries
+        self._read_page(date_str, stamp, None, self.on_log_read)
 
-#--- REPLACE the entire SettingsDialog class with this one ---
+    def _log_stamp(self):
+        """(mtime, size) of the log file, taken after flushing so buffered lines count as growth."""
+        self.logger.flush()
+        try:
+            st = os.stat(self.logger.log_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read_page(self, date_str, stamp, before, on_result):
+        # Read on a worker thread so a large log (or a slow disk) does not freeze the dialog
+        self.status_label.setText("Loading...")
+        worker = Worker(self._task_read_log, date_str, stamp, before)
+        worker.result.connect(on_result)
+        worker.finished.connect(partial(self._read_workers.discard, worker))
+        self._read_workers.add(worker)
+        worker.start()
+
+    def _task_read_log(self, progress_callback, date_str, stamp, before):
+        return (date_str, stamp, before) + self.logger.get_log_tail(date_str, LOG_TAIL_LINES, before)
+
+    def _cache_page(self, date_str, stamp, logs, offset):
+        self._page_cache[date_str] = (stamp, logs, offset)
+        self._page_cache.move_to_end(date_str)
+        if len(self._page_cache) > LOG_PAGE_CACHE_SIZE:
+            self._page_cache.popitem(last=False)
+
+    def on_log_read(self, result):
+        date_str, stamp, _, logs, offset = result
+        self._cache_page(date_str, stamp, logs, offset)
+        if date_str != self._pending_date:
+            return # Another date was picked while this one was being read
+        self._show_logs(date_str, stamp, logs, offset)
+
+    def _show_logs(self, date_str, stamp, logs, offset):
+        self.status_label.setText("")
+        self._shown_key = (date_str, stamp)
+        self._older_offset = None # Not while the new text is laid out at the top of the view
+        # No HTML to build or escape: the highlighter colours each line as it is laid out
+        self.log_display.setPlainText(logs)
+        self.log_display.moveCursor(QTextCursor.MoveOperation.End) # The newest entries are at the bottom
+        self._older_offset = offset
+
+    def on_log_scrolled(self, value):
+        if value != self.log_display.verticalScrollBar().minimum(): return
+        if self._older_offset is None or self._loading_older or self._shown_key is None: return
+        self._loading_older = True
+        date_str, stamp = self._shown_key
+        self._read_page(date_str, stamp, self._older_offset, self.on_older_read)
+
+    def on_older_read(self, result):
+        date_str, stamp, before, logs, offset = result
+        if (date_str, stamp) != self._shown_key or before != self._older_offset:
+            return # The view moved on to another page while this one was being read
+        self.status_label.setText("")
+        self._older_offset = offset
+        if logs:
+            scroll_bar = self.log_display.verticalScrollBar()
+            old_max = scroll_bar.maximum()
+            cursor = QTextCursor(self.log_display.document())
+            cursor.movePosition(QTextCursor.MoveOperation.Start)
+            cursor.insertText(logs + "\n")
+            # Keep the lines the user was looking at in place rather than jumping to the new top
+            scroll_bar.setValue(scroll_bar.value() + scroll_bar.maximum() - old_max)
+        self._loading_older = False
+        self._cache_page(date_str, stamp, self.log_display.toPlainText(), offset)
+
+    def done(self, result):
+        # A QThread must not be destroyed while running; log reads are short, so just wait for them
+        for worker in list(self._read_workers):
+            worker.wait()
+        super().done(result)
 
-#--- REPLACE the entire SettingsDialog class with this one ---
 
 class SettingsDialog(QDialog):
     def __init__(self, current_icons, parent=None):
@@ -1275,7 +2287,6 @@ class SettingsDialog(QDialog):
         self.main_window = parent # Store reference to the main window
         self.setWindowTitle("Settings & Rules")
         self.setMinimumSize(800, 750)
-        self.setStyleSheet(parent.styleSheet())
         
         # --- FIX: Initialize instance attributes at the very top ---
         self.current_icons = current_icons
@@ -1493,8 +2504,7 @@ class SettingsDialog(QDialog):
             self.rules_table.setRowCount(0)
     def save_and_accept(self):
         try:
-            with open(resource_path("config.json"), "r") as f_read:
-                config = json.load(f_read)
+            config = load_json(resource_path("config.json"))
         except (FileNotFoundError, json.JSONDecodeError):
             config = {}
         
@@ -1512,8 +2522,7 @@ class SettingsDialog(QDialog):
         config["custom_icons"] = self.custom_icon_paths
         config["gpu_hashing_enabled"] = self.gpu_checkbox.isChecked()
 
-        with open(resource_path("config.json"), "w") as f:
-            json.dump(config, f, indent=4)
+        save_json(resource_path("config.json"), config)
             
         rules_data = []
         for i in range(self.rules_table.rowCount()):
@@ -1526,8 +2535,7 @@ class SettingsDialog(QDialog):
                 "action": self.rules_table.cellWidget(i, 3).currentText(),
                 "action_value": act_item.text() if act_item else ""
             })
-        with open(resource_path("rules.json"), "w") as f:
-            json.dump(rules_data, f, indent=4)
+        save_json(resource_path("rules.json"), rules_data)
             
         self.accept()
 
@@ -1574,7 +2582,6 @@ class FullScanResultDialog(QDialog):
         self.main_window = parent
         self.processed_sets = processed_sets
         self.setWindowTitle("重复文件分析与清理工具")
-        self.setStyleSheet(parent.styleSheet())
         self.setWindowState(Qt.WindowState.WindowMaximized)
         
         main_layout = QVBoxLayout(self)
@@ -1583,7 +2590,6 @@ class FullScanResultDialog(QDialog):
         self.tree.setColumnCount(5)
         self.tree.setHeaderLabels(["操作", "文件路径", "可节省空间", "总空间占用", "文件数量"])
         self.tree.setAlternatingRowColors(True)
-        self.tree.setSortingEnabled(True)
 
         header = self.tree.header()
         header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
@@ -1606,7 +2612,11 @@ class FullScanResultDialog(QDialog):
         button_box.addWidget(self.confirm_button)
         main_layout.addLayout(button_box)
 
+        # Sorting is switched on only after the bulk insert, so rows are not re-sorted one by one
+        self.tree.setUpdatesEnabled(False)
         self.populate_tree_and_set_defaults()
+        self.tree.setSortingEnabled(True)
+        self.tree.setUpdatesEnabled(True)
         self.connect_widget_signals()
         
         self.tree.expandAll()
@@ -1638,42 +2648,41 @@ class FullScanResultDialog(QDialog):
                 # Set the informative tooltip
                 child_item.setToolTip(1, f"得分: {file_data['score']}\n理由: {file_data['reason']}\n修改日期: {datetime.fromtimestamp(file_data['mtime']).strftime('%Y-%m-%d %H:%M:%S')}")
                 
-                action_widget = ActionWidget()
                 is_best = (file_data["path"] == best_file_path)
                 
-                # Pre-check the button for the best file
-                action_widget.keep_button.setChecked(is_best)
+                # A plain checkable cell marks the file to keep; no widget per row
+                child_item.setFlags(child_item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+                child_item.setCheckState(0, Qt.CheckState.Checked if is_best else Qt.CheckState.Unchecked)
+                child_item.setToolTip(0, "保留这个文件，并清理此组中的其他文件。")
                 
                 if is_best:
                     for col in range(self.tree.columnCount()):
                         child_item.setBackground(col, QColor("#1e4226")) # Highlight the best file
-                        
-                self.tree.setItemWidget(child_item, 0, action_widget)
 
     def connect_widget_signals(self):
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_header = root.child(i)
-            for j in range(group_header.childCount()):
-                child_item = group_header.child(j)
-                action_widget = self.tree.itemWidget(child_item, 0)
-                if action_widget:
-                    action_widget.keep_requested.connect(lambda item=child_item: self._on_keep_requested(item))
+        self.tree.itemChanged.connect(self._on_item_changed)
+
+    def _on_item_changed(self, item, column):
+        if column != 0 or not item.parent(): return
+        if item.checkState(0) == Qt.CheckState.Checked:
+            self._on_keep_requested(item)
+        else:
+            self._update_savings_label()
 
     def _on_keep_requested(self, selected_item):
         parent_group = selected_item.parent()
         if not parent_group: return
+        # setCheckState/setBackground emit itemChanged; block it so this does not re-enter
+        self.tree.blockSignals(True)
         for i in range(parent_group.childCount()):
             item = parent_group.child(i)
-            widget = self.tree.itemWidget(item, 0)
-            if widget:
-                is_the_selected_one = (item == selected_item)
-                widget.keep_button.blockSignals(True)
-                widget.keep_button.setChecked(is_the_selected_one)
-                widget.keep_button.blockSignals(False)
-                bg_color = QColor("#1e4226") if is_the_selected_one else QColor("transparent")
-                for col in range(self.tree.columnCount()):
-                    item.setBackground(col, bg_color)
+            is_the_selected_one = (item == selected_item)
+            item.setCheckState(0, Qt.CheckState.Checked if is_the_selected_one else Qt.CheckState.Unchecked)
+            bg_color = QColor("#1e4226") if is_the_selected_one else QColor("transparent")
+            for col in range(self.tree.columnCount()):
+                item.setBackground(col, bg_color)
+        self.tree.blockSignals(False)
+        self.tree.viewport().update()
         self._update_savings_label()
     
     def get_files_to_trash(self):
@@ -1683,8 +2692,7 @@ class FullScanResultDialog(QDialog):
             group_header = root.child(i)
             for j in range(group_header.childCount()):
                 child = group_header.child(j)
-                action_widget = self.tree.itemWidget(child, 0)
-                if action_widget and not action_widget.keep_button.isChecked():
+                if child.checkState(0) != Qt.CheckState.Checked:
                     file_data = child.data(0, Qt.ItemDataRole.UserRole)
                     if file_data and "path" in file_data:
                         files_to_trash.append(file_data["path"])
@@ -1698,9 +2706,9 @@ class FullScanResultDialog(QDialog):
         path = file_data.get("path")
         if not path: return
         menu = QMenu()
-        open_action = menu.addAction(self.style().standardIcon(QStyle.StandardPixmap.SP_DialogOkButton), "打开文件")
-        show_action = menu.addAction(self.style().standardIcon(QStyle.StandardPixmap.SP_DirIcon), "打开文件所在位置")
-        copy_path_action = menu.addAction(self.style().standardIcon(QStyle.StandardPixmap.SP_FileLinkIcon), "复制文件路径")
+        open_action = menu.addAction(standard_icon(QStyle.StandardPixmap.SP_DialogOkButton), "打开文件")
+        show_action = menu.addAction(standard_icon(QStyle.StandardPixmap.SP_DirIcon), "打开文件所在位置")
+        copy_path_action = menu.addAction(standard_icon(QStyle.StandardPixmap.SP_FileLinkIcon), "复制文件路径")
         action = menu.exec(self.tree.mapToGlobal(pos))
         if action == open_action: self.main_window.open_item(path)
         elif action == show_action: self.main_window.show_in_explorer(path)
@@ -1750,9 +2758,7 @@ class FullScanResultDialog(QDialog):
             group_header = root.child(i)
             file_size = group_header.data(0, Qt.ItemDataRole.UserRole) or 0
             for j in range(group_header.childCount()):
-                child = group_header.child(j)
-                action_widget = self.tree.itemWidget(child, 0)
-                if action_widget and not action_widget.keep_button.isChecked():
+                if group_header.child(j).checkState(0) != Qt.CheckState.Checked:
                     total_files_to_trash += 1
                     total_savings_bytes += file_size
         self.savings_label.setText(
@@ -1775,7 +2781,6 @@ class SettingsDialog(QDialog):
         self.main_window = parent
         self.setWindowTitle("Settings & Rules")
         # self.setMinimumSize(800, 750)
-        self.setStyleSheet(parent.styleSheet())
         main_layout = QVBoxLayout(self)
 
         # Mode Selection
@@ -1822,6 +2827,17 @@ class SettingsDialog(QDialog):
             self.gpu_checkbox.setEnabled(False)
             self.gpu_checkbox.setText(f"{self.gpu_checkbox.text()} (No compatible GPU detected)")
         gpu_group.layout().addWidget(self.gpu_checkbox)
+        workers_layout = QHBoxLayout()
+        workers_label = QLabel("Parallel hashing threads:")
+        workers_label.setStyleSheet("color: #abb2bf;")
+        self.hash_workers_spin = QSpinBox()
+        self.hash_workers_spin.setRange(0, 32)
+        self.hash_workers_spin.setSpecialValueText("Auto")
+        self.hash_workers_spin.setToolTip("Number of files hashed at once during duplicate scans.\nUse 1-2 for spinning hard drives; Auto uses up to 8 on SSDs.")
+        workers_layout.addWidget(workers_label)
+        workers_layout.addWidget(self.hash_workers_spin)
+        workers_layout.addStretch()
+        gpu_group.layout().addLayout(workers_layout)
         main_layout.addWidget(gpu_group)
         
         # ... Other settings groups like Icons and Rules would go here ...
@@ -1868,12 +2884,13 @@ class SettingsDialog(QDialog):
                 self.para_mode_radio.setChecked(True)
                 self.path_stack.widget(0).property("line_edit").setText(config.get("base_directory", ""))
             self.gpu_checkbox.setChecked(config.get("gpu_hashing_enabled", False))
+            self.hash_workers_spin.setValue(config.get("hash_workers", 0))
         except (FileNotFoundError, json.JSONDecodeError):
             pass
 
     def save_and_accept(self):
         try:
-            with open(resource_path("config.json"), "r") as f_read: config = json.load(f_read)
+            config = load_json(resource_path("config.json"))
         except (FileNotFoundError, json.JSONDecodeError): config = {}
         if self.custom_mode_radio.isChecked():
             config["mode"] = "custom"
@@ -1882,7 +2899,8 @@ class SettingsDialog(QDialog):
             config["mode"] = "para"
             config["base_directory"] = self.path_stack.widget(0).property("line_edit").text()
         config["gpu_hashing_enabled"] = self.gpu_checkbox.isChecked()
-        with open(resource_path("config.json"), "w") as f: json.dump(config, f, indent=4)
+        config["hash_workers"] = self.hash_workers_spin.value()
+        save_json(resource_path("config.json"), config)
         self.accept()
 
 
@@ -1976,29 +2994,48 @@ class ParaFileManager(QMainWindow):
         self.base_dir = None
         self.para_folders = {"Projects": "1_Projects", "Areas": "2_Areas", "Resources": "3_Resources", "Archives": "4_Archives"}
         self.para_root_paths = set()
+        self._protected_paths = frozenset() # Normalized PARA folder paths that cleanup never removes
         self.folder_to_category = {v: k for k, v in self.para_folders.items()}
         self.para_category_icons = {}
+        self.para_category_pixmaps = {} # {category: {size: QPixmap}}, scaled once per icon change
         self.rules = []
+        self._rules_by_category = {} # {category: compiled rules}, cleared when the rules are reloaded
         self.scan_rules = {}
         self.move_to_history = []
+        self._context_menu = None # Built on the first right-click, then reused
+        self._context_path = None
         
         # --- Persistent User Data Paths (Defined Early and Correctly) ---
         self.config_path = get_user_data_path("config.json")
         self.rules_path = get_user_data_path("rules.json")
         self.scan_rules_path = get_user_data_path("scan_rules.json")
-        self.hash_cache_db_path = get_user_data_path("hash_cache.db")
+        # Keep one cache per algorithm so SHA-256 and BLAKE3 digests are never compared
+        self.hash_cache_db_path = get_user_data_path("hash_cache.db" if HASH_ALGORITHM == "sha256" else f"hash_cache_{HASH_ALGORITHM}.db")
         self.index_cache_path = get_user_data_path("file_index.cache")
 
         # --- GPU & Caching Properties ---
         self.gpu_hashing_enabled = False
+        self.hash_workers = 0 # Parallel hashing threads, 0 = automatic
         self.gpu_available = False
         self.gpu_status_message = "GPU not available or disabled."
 
         # --- Search & Indexing ---
-        self.file_index = []
+        self.file_index = {} # {path: {"path", "name_lower", "size", "mtime", "ctime"}}
+        self._index_dirs = None # _IndexDirs of file_index, built on the first incremental patch
+        self._changed_dirs = set() # Folders reported by the watcher, applied on reindex_timer
+        self._index_names_blob = None # "\n"-joined name_lower of every entry, rebuilt lazily
+        self._index_items = []
+        self._index_offsets = []
+        self._narrow_cache = None # (term, results) of the last search, narrowed as the user types
+        self._search_cache = OrderedDict() # {term: results} of recent searches, least recent first
+        self._pending_index_dirs = {} # {dir_path: recursive} touched by the running operation
+        self._streamed_index = {} # Records received so far from a streaming re-index
+        self._category_paths = [] # [(category_name, category_path + os.sep)], built in update_ui_from_config
         self.search_timer = QTimer(self)
         self.search_timer.setSingleShot(True)
         self.search_timer.timeout.connect(self.perform_search)
+        self.SEARCH_DEBOUNCE_MS = 150
+        self._last_search_term = None
         self.RESULTS_PER_PAGE = 50
         self.current_search_results = []
         self.current_search_page = 0
@@ -2006,14 +3043,20 @@ class ParaFileManager(QMainWindow):
         # --- Background Worker ---
         self.worker = None
         self.progress = None
+        self._cache_check_worker = None # Quiet re-walk that refreshes an index loaded from the cache
+        self._cache_check_stop = threading.Event() # Set on close so the re-walk ends early
+        self._index_generation = 0 # Bumped whenever file_index changes, so older snapshots can be spotted
         
         # --- File System Watcher ---
         self.file_watcher = QFileSystemWatcher(self)
         self.file_watcher.directoryChanged.connect(self.on_directory_changed)
         self.file_watcher.fileChanged.connect(self.on_file_changed)
+        self._watch_root = None # base_dir the watched folder set was built for
+        self._watched_dirs = set() # Every folder under _watch_root, kept while the watcher is paused
+        self._watch_check_dirs = set() # Changed folders that may have gained sub-folders to watch
         self.reindex_timer = QTimer(self)
         self.reindex_timer.setSingleShot(True)
-        self.reindex_timer.timeout.connect(lambda: self.run_task(self._task_rebuild_file_index, on_success=self.on_index_rebuilt))
+        self.reindex_timer.timeout.connect(self._apply_changed_directories)
         
         # --- Initialization Sequence ---
         self.setup_styles()
@@ -2051,6 +3094,7 @@ class ParaFileManager(QMainWindow):
     # --- REPLACE your existing setup_styles method with this one ---
 
     def setup_styles(self):
+        # Parsed once here; dialogs parented to this window inherit it, so they must not re-apply it
         self.setStyleSheet("""
             /* ---- GENERAL WIDGETS ---- */
             QWidget { 
@@ -2084,7 +3128,7 @@ class ParaFileManager(QMainWindow):
             QSplitter::handle:hover { background-color: #61afef; }
 
             /* ---- VIEWS (Trees, Lists, Tables) ---- */
-            QTreeView, QListWidget, QTableWidget { 
+            QTreeView, QListView, QTableWidget { 
                 background-color: #21252b; 
                 border-radius: 5px; 
                 border: 1px solid #3e4451; 
@@ -2100,11 +3144,11 @@ class ParaFileManager(QMainWindow):
 
 
             /* ---- HOVER and SELECTION STYLES ---- */
-            QTreeView::item:hover, QListWidget::item:hover { 
+            QTreeView::item:hover, QListView::item:hover { 
                 background-color: #3e4451; 
                 border-radius: 4px;
             }
-            QTreeView::item:selected, QListWidget::item:selected {
+            QTreeView::item:selected, QListView::item:selected {
                 /* --- THIS IS THE ENHANCEMENT --- */
                 /* OLD: background-color: #4b5263; */
                 /* NEW: A more prominent but still soft slate blue */
@@ -2113,28 +3157,16 @@ class ParaFileManager(QMainWindow):
                 border: 1px solid #61afef; 
                 border-radius: 4px;
             }
-            
-            /* ---- SEARCH RESULT STYLING ---- */
-            #SearchResultName {
-                font-size: 12pt;
-                font-weight: bold;
-            }
-            #SearchResultPath {
-                font-size: 9pt;
-                color: #82c0ff;
-            }
-            /* 当父项被选中时，专门改变路径的颜色 */
-            QListWidget::item:selected #SearchResultPath {
-                color: #abb2bf; /* 选中时，路径文字也变为柔和的灰色 */
-            }
+
+            /* Search result rows are painted by SearchResultDelegate (name 12pt bold, path 9pt #82c0ff) */
             
             /* ---- OTHER WIDGETS ---- */
             #DropFrame { background-color: #2c313a; border: 2px solid #3e4451; border-radius: 8px; }
-            #DropFrame[dragging="true"] { border: 2px dashed #e5c07b; background-color: #4b5263; }
+            #DropFrameContainer[dragging="true"] #DropFrame { border: 2px dashed #e5c07b; background-color: #4b5263; }
             #WelcomeWidget { background-color: #21252b; border-radius: 5px; }
             QProgressDialog { background-color: #282c34; color: #abb2bf; }
             QProgressDialog QLabel { color: #abb2bf; }
-            QTextBrowser { background-color: #21252b; color: #abb2bf; border-radius: 4px; border: 1px solid #3e4451; font-family: Consolas, monospace; }
+            QTextBrowser, QPlainTextEdit { background-color: #21252b; color: #abb2bf; border-radius: 4px; border: 1px solid #3e4451; font-family: Consolas, monospace; }
             QTableWidget { gridline-color: #3e4451; }
             QTableWidget::item { padding: 5px; border-bottom: 1px solid #3e4451; }
         """)
@@ -2181,7 +3213,7 @@ class ParaFileManager(QMainWindow):
 
 
     def calculate_hash_gpu(self, file_path):
-        """Calculates SHA256 hash using a CUDA kernel for large files."""
+        """Calculates the content hash using a CUDA kernel for large files."""
         from numba import cuda
         import numpy as np
         import math
@@ -2218,6 +3250,37 @@ class ParaFileManager(QMainWindow):
             return self.calculate_hash_gpu(file_path)
         else:
             return calculate_hash(file_path)
+
+    def _hash_files_parallel(self, files):
+        """
+        Hashes (path, size) pairs on a thread pool and yields (path, hash) as each one
+        finishes, so disk reads and hashing of different files overlap.
+        """
+        # Spinning disks slow down with concurrent reads; the Settings dialog lets users lower this
+        workers = self.hash_workers or min(8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.get_hash_for_file, path, size): path for path, size in files}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def _hash_files_cached(self, hm, files):
+        """
+        Yields (path, hash) for (path, mtime, size) triples, answering from the
+        HashManager cache where the file is unchanged and hashing the rest in parallel.
+        New digests are written back; HashManager commits them together on exit.
+        """
+        # Cache lookups stay on this thread (sqlite connection); only the misses go to the pool
+        to_hash, stats = [], {}
+        for path, mtime, size in files:
+            if (file_hash := hm.get_cached_hash(path, mtime, size)):
+                yield path, file_hash
+            else:
+                stats[path] = (mtime, size)
+                to_hash.append((path, size))
+        for path, file_hash in self._hash_files_parallel(to_hash):
+            if file_hash:
+                hm.update_cache(path, *stats[path], file_hash)
+            yield path, file_hash
     def _create_top_bar(self):
         top_bar_layout = QHBoxLayout()
         self.search_bar = QLineEdit()
@@ -2228,8 +3291,6 @@ class ParaFileManager(QMainWindow):
 
         top_bar_layout.addStretch(1)
 
-        style = self.style()
-        
         # --- NEW SCAN BUTTON ---
         # scan_button = QPushButton()
         # # CHANGED ICON to a magnifying glass for "Find/Scan"
@@ -2241,23 +3302,23 @@ class ParaFileManager(QMainWindow):
 
 
         self.scan_button = QPushButton() # Use self.scan_button instead of local variable
-        self.scan_button.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_FileLinkIcon)) # A better icon
+        self.scan_button.setIcon(standard_icon(QStyle.StandardPixmap.SP_FileLinkIcon)) # A better icon
         self.scan_button.clicked.connect(self.start_full_scan)
 
         
         
         about_button = QPushButton()
-        about_button.setIcon(style.standardIcon(QStyle.StandardPixmap.SP_MessageBoxInformation))
+        about_button.setIcon(standard_icon(QStyle.StandardPixmap.SP_MessageBoxInformation))
         about_button.setToolTip("About this application")
         about_button.clicked.connect(self.open_about_dialog)
 
         settings_button = QPushButton()
-        settings_button.setIcon(style.standardIcon(QStyle.StandardPixmap.SP_ComputerIcon))
+        settings_button.setIcon(standard_icon(QStyle.StandardPixmap.SP_ComputerIcon))
         settings_button.setToolTip("Open Settings")
         settings_button.clicked.connect(self.open_settings_dialog)
 
         log_button = QPushButton()
-        log_button.setIcon(style.standardIcon(QStyle.StandardPixmap.SP_FileDialogDetailedView))
+        log_button.setIcon(standard_icon(QStyle.StandardPixmap.SP_FileDialogDetailedView))
         log_button.setToolTip("View Logs")
         log_button.clicked.connect(self.open_log_viewer)
 
@@ -2274,32 +3335,24 @@ class ParaFileManager(QMainWindow):
 
     def _create_drop_frames(self):
         top_pane_widget = QWidget()
+        # The drag highlight is keyed on this container's "dragging" property (see setup_styles)
+        top_pane_widget.setObjectName("DropFrameContainer")
+        top_pane_widget.setProperty("dragging", False)
+        self._drop_container = top_pane_widget
         top_pane_layout = QHBoxLayout(top_pane_widget)
         top_pane_layout.setSpacing(10)
-        style = self.style()
         self.drop_frames = {
-            "Projects": DropFrame("Projects", style.standardIcon(QStyle.StandardPixmap.SP_FileDialogNewFolder), self),
-            "Areas": DropFrame("Areas", style.standardIcon(QStyle.StandardPixmap.SP_DriveHDIcon), self),
-            "Resources": DropFrame("Resources", style.standardIcon(QStyle.StandardPixmap.SP_DirOpenIcon), self),
-            "Archives": DropFrame("Archives", style.standardIcon(QStyle.StandardPixmap.SP_DialogSaveButton), self)
+            "Projects": DropFrame("Projects", standard_icon(QStyle.StandardPixmap.SP_FileDialogNewFolder), self),
+            "Areas": DropFrame("Areas", standard_icon(QStyle.StandardPixmap.SP_DriveHDIcon), self),
+            "Resources": DropFrame("Resources", standard_icon(QStyle.StandardPixmap.SP_DirOpenIcon), self),
+            "Archives": DropFrame("Archives", standard_icon(QStyle.StandardPixmap.SP_DialogSaveButton), self)
         }
         # for frame in self.drop_frames.values():
         #     frame.setObjectName("DropFrame")
         #     top_pane_layout.addWidget(frame)
-        for name, frame in self.drop_frames.items():
-            layout = QVBoxLayout(frame)
-            layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            icon_label = QLabel()
-            # Increase the size here for a more prominent look
-            icon = frame.findChild(QLabel).pixmap().scaled(QSize(64, 64), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            icon_label.setPixmap(icon) # Use the icon from the frame's property
-            # Store the large icon for background use
-            self.para_category_icons[name] = icon_label.pixmap()
-            
-            layout.addWidget(icon_label, alignment=Qt.AlignmentFlag.AlignCenter)
-            title_label = QLabel(name)
-            title_label.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
-            layout.addWidget(title_label, alignment=Qt.AlignmentFlag.AlignCenter)
+        for frame in self.drop_frames.values():
+            # DropFrame lays out its own icon and title; update_ui_from_config swaps in the
+            # pre-scaled DROP_FRAME_ICON_SIZE pixmap once the category icons are loaded
             frame.setObjectName("DropFrame")
             top_pane_layout.addWidget(frame)
 
@@ -2318,8 +3371,13 @@ class ParaFileManager(QMainWindow):
         search_layout.setContentsMargins(0, 0, 0, 0)
         search_layout.setSpacing(5)
 
-        self.search_results_list = QListWidget()
-        self.search_results_list.itemDoubleClicked.connect(self.open_selected_item)
+        # Model/view with a painting delegate: no widget is built per result row
+        self.search_results_model = SearchResultsModel(self)
+        self.search_results_list = QListView()
+        self.search_results_list.setModel(self.search_results_model)
+        self.search_results_list.setItemDelegate(SearchResultDelegate(self, self.search_results_list))
+        self.search_results_list.setUniformItemSizes(True)
+        self.search_results_list.doubleClicked.connect(self.open_selected_item)
         # Add the context menu to the search results list
         self.search_results_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.search_results_list.customContextMenuRequested.connect(self.show_search_result_context_menu)
@@ -2330,11 +3388,11 @@ class ParaFileManager(QMainWindow):
         controls_layout.setContentsMargins(5, 5, 5, 5)
         
         self.prev_page_button = QPushButton("  Previous")
-        self.prev_page_button.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_ArrowLeft))
+        self.prev_page_button.setIcon(standard_icon(QStyle.StandardPixmap.SP_ArrowLeft))
         self.prev_page_button.clicked.connect(self.go_to_previous_page)
         
         self.next_page_button = QPushButton("Next  ")
-        self.next_page_button.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_ArrowRight))
+        self.next_page_button.setIcon(standard_icon(QStyle.StandardPixmap.SP_ArrowRight))
         self.next_page_button.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
         self.next_page_button.clicked.connect(self.go_to_next_page)
 
@@ -2376,9 +3434,10 @@ class ParaFileManager(QMainWindow):
 
 
     def _create_tree_view(self):
-        tree_view = ThemedTreeView(self) # Or DropTreeView if you reverted
-        self.file_system_model = QFileSystemModel()
-        self.file_system_model.setFilter(QDir.Filter.AllDirs | QDir.Filter.NoDotAndDotDot | QDir.Filter.AllEntries)
+        tree_view = ThemedTreeView(self)
+        # Lazy scandir-backed model: QFileSystemModel stat()s every entry it touches,
+        # which is very slow on large folders and network drives.
+        self.file_system_model = LazyFileSystemModel(self)
         tree_view.setModel(self.file_system_model)
         tree_view.setSortingEnabled(True)
         tree_view.sortByColumn(0, Qt.SortOrder.AscendingOrder)
@@ -2397,72 +3456,51 @@ class ParaFileManager(QMainWindow):
         return tree_view
     
     def _build_context_menu(self, path):
-        """Builds a context menu for a given file/folder path."""
-        menu = QMenu()
+        """
+        Returns the context menu for a given file/folder path. The menu and its
+        actions are built once; each call only swaps in the path the actions use.
+        """
         if not path or not os.path.exists(path):
-            return menu
+            return QMenu()
+        self._context_path = path
+        if self._context_menu is not None:
+            return self._context_menu
+
+        def current_path():
+            return self._context_path
+
+        def target_dir():
+            # New items go inside a folder, or next to a file
+            path = current_path()
+            return path if os.path.isdir(path) else os.path.dirname(path)
 
-        style = self.style()
-        
-        # --- NEW "COPY PATH" ACTION ---
         def copy_path_to_clipboard():
-            QApplication.clipboard().setText(os.path.normpath(path))
-            self.log_and_show(f"Path copied: {os.path.normpath(path)}", "info", 2000)
+            path = os.path.normpath(current_path())
+            QApplication.clipboard().setText(path)
+            self.log_and_show(f"Path copied: {path}", "info", 2000)
 
-        copy_action = QAction(style.standardIcon(QStyle.StandardPixmap.SP_FileLinkIcon), "Copy File Path", menu)
-        copy_action.triggered.connect(copy_path_to_clipboard)
-        # --- END NEW ACTION ---
+        menu = QMenu(self)
 
-        # Determine the target directory for new items
-        target_dir = path if os.path.isdir(path) else os.path.dirname(path)
-            
         # "New" Submenu
         new_menu = QMenu("New", menu)
-        new_menu.setIcon(style.standardIcon(QStyle.StandardPixmap.SP_FileDialogNewFolder))
-        folder_action = new_menu.addAction("Folder..."); folder_action.triggered.connect(lambda: self.create_new_folder(target_dir))
-        file_action = new_menu.addAction("File..."); file_action.triggered.connect(lambda: self.create_new_file(target_dir))
+        new_menu.setIcon(standard_icon(QStyle.StandardPixmap.SP_FileDialogNewFolder))
+        new_menu.addAction("Folder...", lambda: self.create_new_folder(target_dir()))
+        new_menu.addAction("File...", lambda: self.create_new_file(target_dir()))
         menu.addMenu(new_menu)
-        menu.addSeparator()
-
-        # # "Move To..." Submenu
-        # current_category = self.get_category_from_path(path)
-        # if current_category:
-        #     move_menu = QMenu("Move To...", menu)
-        #     move_menu.setIcon(style.standardIcon(QStyle.StandardPixmap.SP_ArrowRight))
-        #     # icons = {name: frame.findChild(QLabel).pixmap() for name, frame in self.drop_frames.items()}
-            
-        #     icons = self.para_category_icons
-        
-        #     for cat_name in self.para_folders.keys():
-        #         action = QAction(icons.get(cat_name), cat_name, self) # Use the QIcon directly
-            
-            
-        #     # for cat_name in self.para_folders.keys():
-        #     #     action = QAction(QIcon(icons.get(cat_name)), cat_name, self)
-        #         if cat_name == current_category:
-        #             action.setEnabled(False); action.setToolTip(f"Item is already in {cat_name}")
-        #         else:
-        #             action.triggered.connect(lambda checked, p=path, cat=cat_name: self.handle_move_to_category(p, cat))
-        #         move_menu.addAction(action)
-        #     menu.addMenu(move_menu)
-        #     menu.addSeparator()
-
-        move_action = QAction(self.style().standardIcon(QStyle.StandardPixmap.SP_ArrowRight), "Move To...", menu)
-        move_action.triggered.connect(self.show_move_to_dialog)
-        menu.addMenu(new_menu) # Assuming 'new_menu' is defined above as before
-        menu.addAction(move_action) # Add the direct move action
+        menu.addAction(standard_icon(QStyle.StandardPixmap.SP_ArrowRight), "Move To...", self.show_move_to_dialog)
         menu.addSeparator()
         
         # Standard Actions
-        menu.addAction(style.standardIcon(QStyle.StandardPixmap.SP_DialogOkButton), "Open", lambda: self.open_item(path))
-        menu.addAction(style.standardIcon(QStyle.StandardPixmap.SP_DirIcon), "Show in File Explorer", lambda: self.show_in_explorer(path))
-        menu.addAction(copy_action) # <-- Add the new copy action here
+        menu.addAction(standard_icon(QStyle.StandardPixmap.SP_DialogOkButton), "Open", lambda: self.open_item(current_path()))
+        menu.addAction(standard_icon(QStyle.StandardPixmap.SP_DirIcon), "Show in File Explorer", lambda: self.show_in_explorer(current_path()))
+        menu.addAction(standard_icon(QStyle.StandardPixmap.SP_FileLinkIcon), "Copy File Path", copy_path_to_clipboard)
         menu.addSeparator()
         
-        index = self.file_system_model.index(path)
-        menu.addAction(style.standardIcon(QStyle.StandardPixmap.SP_FileLinkIcon), "Rename...", lambda: self.rename_item(index))
-        menu.addAction(style.standardIcon(QStyle.StandardPixmap.SP_TrashIcon), "Delete...", lambda: self.delete_item(index))
+        # Bind the resolved path, not a QModelIndex: rows can shift before the action fires
+        menu.addAction(standard_icon(QStyle.StandardPixmap.SP_FileLinkIcon), "Rename...", lambda: self.rename_item_by_path(current_path()))
+        menu.addAction(standard_icon(QStyle.StandardPixmap.SP_TrashIcon), "Delete...", lambda: self.delete_item_by_path(current_path()))
         
+        self._context_menu = menu
         return menu
         
     def dragEnterEvent(self, event):
@@ -2475,9 +3513,15 @@ class ParaFileManager(QMainWindow):
         event.accept()
 
     def set_drop_frame_style(self, is_dragging):
+        # Drag enter/leave fire over and over while the cursor crosses the frames;
+        # only restyle when the state actually flips.
+        if bool(self._drop_container.property("dragging")) == is_dragging:
+            return
+        self._drop_container.setProperty("dragging", is_dragging)
+        style = self._drop_container.style()
         for frame in self.drop_frames.values():
-            frame.setProperty("dragging", is_dragging)
-            frame.style().polish(frame)
+            style.unpolish(frame)
+            style.polish(frame)
 
     def reset_drop_frame_styles(self):
         self.set_drop_frame_style(False)
@@ -2487,16 +3531,18 @@ class ParaFileManager(QMainWindow):
         if level == "info": self.logger.info(message)
         elif level == "warn": self.logger.warn(message)
         elif level == "error": self.logger.error(message)
-        QApplication.processEvents()
+        # No processEvents() here: the status bar repaints on the next event loop pass,
+        # and re-entering the loop from callbacks caused nested event handling.
 
 
 
 # --- In the ParaFileManager class, REPLACE the run_task method ---
 
-    def run_task(self, task_func, on_success, **kwargs):
+    def run_task(self, task_func, on_success, on_batch=None, **kwargs):
         """
         Starts a background task with a progress dialog. This version correctly
-        instantiates the worker with all necessary arguments.
+        instantiates the worker with all necessary arguments. If on_batch is given,
+        the task receives a `batch_callback` that streams lists to it.
         """
         self.logger.info(f"--- 'run_task' called for task: {task_func.__name__} ---")
         if self.worker and self.worker.isRunning():
@@ -2513,6 +3559,9 @@ class ParaFileManager(QMainWindow):
         # The Worker now receives the target function and its arguments directly.
         # The progress signal is automatically handled by the Worker's __init__.
         self.worker = Worker(task_func, **kwargs)
+        if on_batch:
+            self.worker.kwargs["batch_callback"] = self.worker.batch_ready.emit
+            self.worker.batch_ready.connect(on_batch)
 
         self.worker.result.connect(on_success)
         self.worker.error.connect(self.on_task_error)
@@ -2605,6 +3654,7 @@ class ParaFileManager(QMainWindow):
     
 
 
+    @pyqtSlot(QModelIndex)
     def on_tree_item_clicked(self, index):
         """When an item is clicked, update the tree view's background text."""
         path = self.file_system_model.filePath(index)
@@ -2643,8 +3693,7 @@ class ParaFileManager(QMainWindow):
         """
         self.log_and_show("Reloading configuration...", "info", 2000)
         try:
-            with open(resource_path("config.json"), "r") as f:
-                config = json.load(f)
+            config = load_json(resource_path("config.json"))
 
             self.operating_mode = config.get("mode", "para")
             
@@ -2664,18 +3713,19 @@ class ParaFileManager(QMainWindow):
                 self.para_root_paths = {os.path.join(self.base_dir, p) for p in self.para_folders.values()}
 
             os.makedirs(self.base_dir, exist_ok=True)
+            self._protected_paths = frozenset(os.path.normpath(os.path.join(self.base_dir, d)) for d in self.para_folders.values())
             self._load_scan_rules()
-            with open(self.rules_path, "r", encoding="utf-8") as f:
-                self.rules = json.load(f)
+            self.rules = load_json(self.rules_path)
 
             # self.operating_mode = config.get("mode", "para")
             self.gpu_hashing_enabled = config.get("gpu_hashing_enabled", False)
+            self.hash_workers = config.get("hash_workers", 0)
             self.move_to_history = config.get("move_to_history", [])
             custom_icons = config.get("custom_icons", {})
             self._load_para_icons(custom_icons)
             
-            with open(resource_path("rules.json"), "r") as f:
-                self.rules = json.load(f)
+            self.rules = load_json(resource_path("rules.json"))
+            self._rules_by_category.clear()
         
         except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
             self.log_and_show(f"Configuration error: {e}. Please check settings.", "warn", 10000)
@@ -2689,20 +3739,19 @@ class ParaFileManager(QMainWindow):
         
         # --- Centralized Cache Loading Logic ---
         try:
-            with open(self.index_cache_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            cache_data = load_json(self.index_cache_path)
             # CRITICAL CHECK: Ensure the cache was built for the CURRENT base directory.
             if cache_data.get("base_dir") == self.base_dir:
                 self.logger.info("Valid cache found for current base directory.")
-                self.file_index = cache_data.get("file_index", [])
-                self.on_index_rebuilt(self.file_index, from_cache=True)
+                self.on_index_rebuilt(cache_data.get("file_index", []), from_cache=True)
+                self._check_index_cache()
                 return
             else:
                 self.logger.info("Cache found, but for a different base directory. Re-indexing.")
         except (FileNotFoundError, json.JSONDecodeError, KeyError):
             self.logger.info("No valid cache found. Performing full re-index.")
         
-        self.run_task(self._task_rebuild_file_index, on_success=self.on_index_rebuilt)
+        self.start_index_rebuild()
         
         
     def update_ui_from_config(self):
@@ -2730,18 +3779,28 @@ class ParaFileManager(QMainWindow):
         if is_para_mode:
             for name, frame in self.drop_frames.items():
                 icon_label = frame.findChild(QLabel)
-                if icon_label and name in self.para_category_icons:
-                    pixmap = self.para_category_icons[name].pixmap(QSize(64, 64))
-                    icon_label.setPixmap(pixmap)
+                if icon_label and (pixmaps := self.para_category_pixmaps.get(name)):
+                    icon_label.setPixmap(pixmaps[DROP_FRAME_ICON_SIZE])
+
+        self._category_paths = [(cat_name, os.path.normpath(os.path.join(self.base_dir, folder_name)) + os.sep)
+                                for cat_name, folder_name in self.para_folders.items()]
 
         self.bottom_pane.setCurrentWidget(self.tree_view)
-        self.file_system_model.setRootPath(self.base_dir)
-        self.tree_view.setRootIndex(self.file_system_model.index(self.base_dir))
+        # Hide the extra columns before the model is populated to avoid a second layout pass
         for i in range(1, self.file_system_model.columnCount()):
             self.tree_view.hideColumn(i)
+        # Let the window paint first; the root folder is listed on the next event loop turn
+        QTimer.singleShot(0, self._populate_tree_view)
         
         self.log_and_show(f"Mode: {self.operating_mode.upper()}. Root: {self.base_dir}", "info")
 
+    def _populate_tree_view(self):
+        """Points the tree model at the current base directory."""
+        if not self.base_dir: return
+        if self.file_system_model.rootPath() != self.base_dir:
+            self.file_system_model.setRootPath(self.base_dir)
+        self.tree_view.setRootIndex(QModelIndex()) # The model's invisible root is base_dir itself
+
     def on_scan_completed(self, result, dest_root, category_name):
         """
         Callback for when the duplicate scan is finished.
@@ -2774,7 +3833,13 @@ class ParaFileManager(QMainWindow):
 
     def on_final_refresh_finished(self, result=None):
         if result: self.log_and_show(str(result), "info")
-        self.run_task(self._task_rebuild_file_index, on_success=self.on_index_rebuilt)
+        pending, self._pending_index_dirs = self._pending_index_dirs, {}
+        self._watch_check_dirs.update(pending)
+        if pending:
+            # Only re-scan the folders the operation touched instead of the whole base directory
+            self.run_task(self._task_update_file_index, on_success=self.on_index_rebuilt, dirs=pending)
+        else:
+            self.start_index_rebuild()
         # self.run_task(self._task_rebuild_file_index, on_success=lambda r: self.log_and_show(r, "info", 2000))
     
     #--- REPLACE your on_index_rebuilt method with this one ---
@@ -2793,14 +3858,28 @@ class ParaFileManager(QMainWindow):
         if self.file_watcher.directories():
             self.file_watcher.removePaths(self.file_watcher.directories())
             
-        paths_to_watch = {self.base_dir}
+        paths_to_watch = {os.path.normpath(self.base_dir)}
         for root, dirs, _ in os.walk(self.base_dir):
             for d in dirs:
-                paths_to_watch.add(os.path.join(root, d))
+                paths_to_watch.add(os.path.normpath(os.path.join(root, d)))
                 
         self.file_watcher.addPaths(list(paths_to_watch))
+        self._watch_root, self._watched_dirs = self.base_dir, paths_to_watch
+        self._watch_check_dirs = set()
         self.logger.info(f"Now monitoring {len(paths_to_watch)} directories for real-time changes.")
 
+    def _refresh_watched_directories(self):
+        """
+        Brings the watched folder set up to date after changes without re-walking the PARA tree:
+        vanished folders are dropped and only new sub-folders of changed folders are walked.
+        """
+        check, self._watch_check_dirs = self._watch_check_dirs, set()
+        watched = {d for d in self._watched_dirs if os.path.isdir(d)}
+        add_new_subdirs(os.path.normpath(self.base_dir), check, watched)
+        self._watched_dirs = watched
+        if (missing := watched.difference(map(os.path.normpath, self.file_watcher.directories()))):
+            self.file_watcher.addPaths(list(missing))
+
     # def on_directory_changed(self, path):
     #     """A directory has been modified (file added/deleted/renamed)."""
     #     self.logger.info(f"Directory change detected: {path}. Triggering a debounced re-index.")
@@ -2810,33 +3889,90 @@ class ParaFileManager(QMainWindow):
     #         self.log_and_show("File changes detected, updating index...", "info", 2000)
     #     self.search_timer.start(3000) # Wait 3 seconds after last change to re-index
     def on_directory_changed(self, path):
-        """A directory has been modified. Trigger the new debounced re-index timer."""
+        """A directory has been modified. Queue it for the debounced incremental update."""
         self.logger.info(f"Directory change detected: {path}. Triggering a debounced re-index.")
+        self.file_system_model.refresh_directory(path)
+        self._changed_dirs.add(os.path.normpath(path))
+        self._watch_check_dirs.add(os.path.normpath(path))
         if not self.reindex_timer.isActive():
             self.log_and_show("File changes detected, updating index in 3 seconds...", "info", 3000)
         # Use the new, dedicated timer
         self.reindex_timer.start(3000)
 
+    def _apply_changed_directories(self):
+        """Patches the index for every folder the watcher reported, without a full re-walk."""
+        if self.worker and self.worker.isRunning():
+            # The operation replaces file_index when it finishes; patch after that
+            self.reindex_timer.start(3000)
+            return
+        changed, self._changed_dirs = self._changed_dirs, set()
+        for dir_path in sorted(changed):
+            self._update_index_for_directory(dir_path)
+        self._refresh_watched_directories()
+        if self.search_bar.text().strip():
+            self.perform_search()
+
     def on_file_changed(self, path):
         """A single file's content has changed."""
         self.logger.info(f"File content change detected: {path}. Updating its metadata.")
         # Find and update the specific file in the index
-        for i, item in enumerate(self.file_index):
-            if item["path"] == path:
-                try:
-                    stat = os.stat(path)
-                    self.file_index[i]["mtime"] = stat.st_mtime
-                    self.file_index[i]["size"] = stat.st_size
-                    # No need for a full rebuild, just a small update
-                except FileNotFoundError:
-                    # The file was likely deleted, the directory change will handle it
-                    pass
-                break
+        item = self.file_index.get(os.path.normpath(path))
+        if item:
+            try:
+                stat = os.stat(path)
+                item["mtime"] = stat.st_mtime
+                item["size"] = stat.st_size
+                # No need for a full rebuild, just a small update
+            except FileNotFoundError:
+                # The file was likely deleted, the directory change will handle it
+                pass
         
 
 
 # --- In ParaFileManager, REPLACE the on_index_rebuilt method ---
 
+    def start_index_rebuild(self):
+        """Runs a full re-index, collecting its records batch by batch as they are found."""
+        self._streamed_index = {}
+        self.run_task(self._task_rebuild_file_index, on_success=self.on_index_rebuilt, on_batch=self.on_index_batch)
+
+    def _check_index_cache(self):
+        """
+        The cache may predate changes made while the app was closed. Re-walks the base
+        directory in the background without a progress dialog; records whose size and
+        times still match are reused, so an unchanged tree is detected cheaply.
+        """
+        if self._cache_check_worker and self._cache_check_worker.isRunning():
+            return
+        worker = Worker(self._task_rebuild_file_index, stop_event=self._cache_check_stop)
+        worker.result.connect(partial(self.on_index_cache_checked, self._index_generation))
+        worker.error.connect(lambda msg: self.logger.warn(f"Index cache check failed: {msg}"))
+        self._cache_check_worker = worker
+        worker.start()
+
+    def on_index_cache_checked(self, generation, index_data):
+        if index_data is None or generation != self._index_generation or (self.worker and self.worker.isRunning()):
+            return # Stopped, or superseded by a newer index (or by an operation that will produce one)
+        old = self.file_index
+        if len(index_data) == len(old) and all(old.get(item["path"]) is item for item in index_data):
+            self.logger.info("File index cache is up to date.")
+            return
+        self.logger.info("File index cache was stale, applying the fresh index.")
+        self.on_index_rebuilt(index_data)
+
+    def closeEvent(self, event):
+        # The cache check has no Cancel button; stop its walk rather than destroy a running QThread
+        if self._cache_check_worker:
+            self._cache_check_stop.set()
+            self._cache_check_worker.wait()
+        super().closeEvent(event)
+
+    def on_index_batch(self, batch):
+        """Merges one streamed batch so the final hand-over has no big list to convert."""
+        if not self._streamed_index and self.base_dir and not self.search_bar.text().strip():
+            self.bottom_pane.setCurrentWidget(self.tree_view)
+        self._streamed_index.update((item["path"], item) for item in batch)
+
     def on_index_rebuilt(self, index_data, from_cache=False):
         """
         Callback for when file index is built. This is now the SOLE place
@@ -2845,14 +3981,19 @@ class ParaFileManager(QMainWindow):
         if self.progress and self.progress.isVisible():
             self.progress.close()
             
+        if index_data is None: # The records were streamed through on_index_batch
+            index_data, self._streamed_index = self._streamed_index, {}
         self.log_and_show(f"Indexing complete. {len(index_data)} items indexed.", "info", 2000)
-        self.file_index = index_data
+        # Tasks and the JSON cache hand over a list; keep it keyed by path for incremental updates
+        self.file_index = index_data if isinstance(index_data, dict) else {item["path"]: item for item in index_data}
+        self._index_dirs = None
+        self._index_generation += 1
+        self._index_names_blob = None
         
         if not from_cache:
             try:
-                cache_to_save = { "base_dir": self.base_dir, "file_index": self.file_index }
-                with open(self.index_cache_path, 'w', encoding='utf-8') as f:
-                    json.dump(cache_to_save, f)
+                cache_to_save = { "base_dir": self.base_dir, "file_index": list(self.file_index.values()) }
+                save_json(self.index_cache_path, cache_to_save, indent=None)
                 self.logger.info(f"File index cache saved to {self.index_cache_path}")
             except Exception as e:
                 self.logger.error(f"Failed to save file index cache: {e}", exc_info=True)
@@ -2860,6 +4001,8 @@ class ParaFileManager(QMainWindow):
         # THIS IS THE FIX: The watcher is only re-enabled here, after all
         # internal operations (including the re-index itself) are finished.
         self._enable_watcher() 
+        # The watcher was off during the operation, so pick up changes in any expanded folders.
+        self.file_system_model.refresh_loaded()
         
         if self.search_bar.text().strip():
             self.perform_search()
@@ -3354,7 +4497,9 @@ class ParaFileManager(QMainWindow):
             return {}
         
         self.logger.info("Starting Developer-Aware scan...")
-        all_files_on_disk = get_all_files_in_paths([self.base_dir])
+        # Entries are filtered as the walk streams them; only the paths are kept for cache pruning
+        all_files_on_disk = set()
+        report_state = [0.0]
         
         # --- Filtering Logic (NEW) ---
         excluded_dirs = set(self.scan_rules.get("excluded_dir_names", []))
@@ -3362,9 +4507,11 @@ class ParaFileManager(QMainWindow):
         excluded_exts = set(self.scan_rules.get("excluded_extensions", []))
         excluded_names = set(self.scan_rules.get("excluded_filenames", []))
 
-        filtered_files = []
-        for path in all_files_on_disk:
-            filename = os.path.basename(path).lower()
+        filtered_files, stats = [], {}
+        for entry in _iter_index(self.base_dir):
+            path = entry.path
+            all_files_on_disk.add(path)
+            filename = entry.name.lower()
             ext = os.path.splitext(filename)[1]
             path_parts = set(path.lower().split(os.sep))
             
@@ -3374,50 +4521,45 @@ class ParaFileManager(QMainWindow):
             if any(part in path.lower() for part in excluded_path_parts): continue
             
             try:
-                # Also exclude very small files from hashing
-                if os.path.getsize(path) < 4096: continue
-            except FileNotFoundError:
+                stat = entry.stat() # Cached from the directory listing
+            except (FileNotFoundError, PermissionError):
                 continue
+            # Also exclude very small files from hashing
+            if stat.st_size < 4096: continue
             
+            stats[path] = (stat.st_mtime, stat.st_size)
             filtered_files.append(path)
         
         excluded_count = len(all_files_on_disk) - len(filtered_files)
         self.logger.info(f"Scan filtering complete. Excluded {excluded_count} development/system files.")
 
+        # Files with a size no other file shares cannot have a duplicate, so they are never hashed
+        size_counts = {}
+        for current_mtime, current_size in stats.values():
+            size_counts[current_size] = size_counts.get(current_size, 0) + 1
+        candidates = [p for p in filtered_files if size_counts[stats[p][1]] > 1]
+
         # --- Hashing Logic ---
         hashes = {}
-        total_steps = len(filtered_files) + 1
-        self.logger.info(f"Processing {len(filtered_files)} files using hash cache.")
+        total_steps = len(candidates) + 1
+        self.logger.info(f"Processing {len(candidates)} size-matched files (of {len(filtered_files)}) using hash cache.")
 
         with HashManager(self.hash_cache_db_path, self.logger) as hm:
-            for i, file_path in enumerate(filtered_files):
-                filename = os.path.basename(file_path)
-                progress_callback(f"Checking: {filename}", i + 1, total_steps)
-                
-                try:
-                    stat = os.stat(file_path)
-                    current_mtime = stat.st_mtime
-                    current_size = stat.st_size
-                    file_hash = hm.get_cached_hash(file_path, current_mtime, current_size)
-                    
-                    if not file_hash:
-                        progress_callback(f"Hashing: {filename}", i + 1, total_steps)
-                        file_hash = self.get_hash_for_file(file_path, current_size)
-                        if file_hash:
-                            hm.update_cache(file_path, current_mtime, current_size, file_hash)
-                    
-                    if file_hash:
-                        if file_hash not in hashes: hashes[file_hash] = []
-                        hashes[file_hash].append(file_path)
-                except (FileNotFoundError, PermissionError) as e:
-                    self.logger.warn(f"Could not access or hash {file_path}: {e}")
+            candidate_stats = [(p, *stats[p]) for p in candidates]
+            for i, (file_path, file_hash) in enumerate(self._hash_files_cached(hm, candidate_stats)):
+                maybe_report(progress_callback, f"Hashing: {os.path.basename(file_path)}", i + 1, total_steps, report_state)
+                if not file_hash:
+                    self.logger.warn(f"Could not access or hash {file_path}")
                     continue
+                if file_hash not in hashes: hashes[file_hash] = []
+                hashes[file_hash].append(file_path)
 
             progress_callback("Finalizing and cleaning cache...", total_steps, total_steps)
-            pruned_count = hm.prune_cache(set(all_files_on_disk))
+            pruned_count = hm.prune_cache(all_files_on_disk)
             self.logger.info(f"Cache pruning complete. Pruned {pruned_count} stale entries.")
         
-        duplicate_sets = {h: p for h, p in hashes.items() if len(p) > 1}
+        # Hand over the (mtime, size) already read during the walk so the GUI thread does not stat again
+        duplicate_sets = {h: [(p, *stats[p]) for p in paths] for h, paths in hashes.items() if len(paths) > 1}
         self.logger.info(f"Intelligent scan complete. Found {len(duplicate_sets)} set(s) of duplicate files.")
         return duplicate_sets
 
@@ -3426,24 +4568,22 @@ class ParaFileManager(QMainWindow):
         """Moves a list of files/folders to a new destination, handling conflicts."""
         total = len(source_paths)
         self.logger.info(f"Starting internal move of {total} items to '{destination_dir}'")
+        existing_names, devices = {}, {}
+        affected_dirs = set()
+        report_state = [0.0]
 
         for i, source_path in enumerate(source_paths):
             base_name = os.path.basename(source_path)
-            progress_callback(f"Moving: {base_name}", i + 1, total)
+            maybe_report(progress_callback, f"Moving: {base_name}", i + 1, total, report_state)
 
             if not os.path.exists(source_path):
                 self.logger.warn(f"Source item not found, skipping: {source_path}")
                 continue
 
-            dest_path = os.path.join(destination_dir, base_name)
-            if os.path.exists(dest_path): # Handle name conflicts
-                base, ext = os.path.splitext(base_name)
-                counter = 1
-                while os.path.exists(dest_path):
-                    dest_path = os.path.join(destination_dir, f"{base}_conflict_{counter}{ext}")
-                    counter += 1
+            dest_path = self._free_path_in(destination_dir, base_name, "_conflict_", existing_names)
             try:
-                shutil.move(source_path, dest_path)
+                self._move_path(source_path, dest_path, devices)
+                affected_dirs.add(os.path.dirname(source_path))
             except Exception as e:
                 self.logger.error(f"Failed to move '{source_path}' to '{dest_path}'", exc_info=True)
         # After moving files, try to clean up any newly empty folders
@@ -3455,52 +4595,61 @@ class ParaFileManager(QMainWindow):
 
 #--- In ParaFileManager, REPLACE this method ---
 
-    def _task_scan_for_duplicates(self, progress_callback, source_paths, files_to_hash_dest):
-        source_files = get_all_files_in_paths(source_paths)
-        total_work = len(files_to_hash_dest) + len(source_files)
+    def _task_scan_for_duplicates(self, progress_callback, source_paths, dest_selection):
+        progress_callback("Listing selected destination files...", 0, 0)
+        files_to_hash_dest = CheckableFileSystemModel.list_checked_files(*dest_selection)
+        # Sizes are captured during the walk so the size prefilter needs no extra stat() per file
+        source_files = list(iter_files_with_stat(source_paths))
+        source_sizes = {size for _, size in source_files}
+        # A destination file can only match a source of the same size; the rest are never hashed
+        dest_files = []
+        for f in files_to_hash_dest:
+            try:
+                stat = os.stat(f)
+            except FileNotFoundError:
+                continue
+            if stat.st_size in source_sizes:
+                dest_files.append((f, stat.st_mtime, stat.st_size))
+        dest_sizes = {f: size for f, _, size in dest_files}
+        total_work = len(dest_files) + len(source_files)
         # This summary log message is good and will be kept.
-        self.logger.info(f"Starting Smart Scan. Hashing {len(files_to_hash_dest)} destination files and checking {len(source_files)} source files.")
+        self.logger.info(f"Starting Smart Scan. Hashing {len(dest_files)} of {len(files_to_hash_dest)} destination files and checking {len(source_files)} source files.")
 
-        dest_hashes = {}
-        for i, f in enumerate(files_to_hash_dest):
-            # The progress dialog will still show the file-by-file progress.
-            progress_callback(f"Hashing destination: {os.path.basename(f)}", i, total_work)
-            
-            # --- CHANGE ---
-            # The line below was removed to keep the log file clean.
-            # self.logger.info(f"Hashing destination file: {f}") 
-            
-            if (file_hash := calculate_hash(f)):
-                dest_hashes[file_hash] = f
+        # {size: {hash: path}}; several destination files can share a size with different contents
+        dest_size_to_hashes = {}
+        # Results arrive as fast as the pool finishes them; a signal per file would flood the GUI thread
+        report_state = [0.0]
+        # Destination files rarely change between drops, so their digests come from the hash cache
+        with HashManager(self.hash_cache_db_path, self.logger) as hm:
+            for i, (f, file_hash) in enumerate(self._hash_files_cached(hm, dest_files)):
+                # The progress dialog will still show the file-by-file progress.
+                maybe_report(progress_callback, f"Hashing destination: {os.path.basename(f)}", i + 1, total_work, report_state)
+                if file_hash:
+                    dest_size_to_hashes.setdefault(dest_sizes[f], {})[file_hash] = f
 
         duplicates, non_duplicates = [], []
-        dest_size_to_hash = {}
-        for h, p in dest_hashes.items():
-            try:
-                dest_size_to_hash[os.path.getsize(p)] = h
-            except FileNotFoundError:
-                continue
 
-        current_work_offset = len(files_to_hash_dest)
-        for i, f in enumerate(source_files):
-            progress_callback(f"Checking source file: {os.path.basename(f)}", current_work_offset + i, total_work)
-            try:
-                size = os.path.getsize(f)
-                if size in dest_size_to_hash:
-                    # --- CHANGE ---
-                    # The line below was removed to keep the log file clean.
-                    # self.logger.info(f"Hashing source (size match): {f}")
-                    file_hash = calculate_hash(f)
-                    if file_hash and file_hash in dest_hashes:
-                        # This log message is IMPORTANT and is kept.
-                        self.logger.info(f"DUPLICATE FOUND: Source '{f}' matches destination '{dest_hashes[file_hash]}'")
-                        duplicates.append((f, dest_hashes[file_hash], file_hash))
-                    else:
-                        non_duplicates.append(f)
-                else:
-                    non_duplicates.append(f)
-            except FileNotFoundError:
+        # Only sources whose size matches a hashed destination file can be duplicates; hash just those
+        to_hash = []
+        for f, size in source_files:
+            if size in dest_size_to_hashes:
+                to_hash.append((f, size))
+            else:
+                non_duplicates.append(f)
+
+        current_work_offset = len(dest_files) + len(non_duplicates)
+        source_sizes = dict(to_hash)
+        for i, (f, file_hash) in enumerate(self._hash_files_parallel(to_hash)):
+            maybe_report(progress_callback, f"Checking source file: {os.path.basename(f)}", current_work_offset + i + 1, total_work, report_state)
+            if file_hash and (dest_path := dest_size_to_hashes[source_sizes[f]].get(file_hash)):
+                # This log message is IMPORTANT and is kept.
+                self.logger.info(f"DUPLICATE FOUND: Source '{f}' matches destination '{dest_path}'")
+                # The size rides along so the dedup dialog does not stat every row again
+                duplicates.append((f, dest_path, file_hash, source_sizes[f]))
+            elif file_hash is None and not os.path.exists(f):
                 self.logger.warn(f"Source file not found during scan, skipping: {f}")
+            else:
+                non_duplicates.append(f)
         
         # This summary log message is also good and will be kept.
         self.logger.info(f"Scan complete. Found {len(duplicates)} duplicate(s).")
@@ -3509,24 +4658,19 @@ class ParaFileManager(QMainWindow):
     def _task_process_simple_drop(self, progress_callback, dropped_paths, dest_root, category_name):
         all_source_files = get_all_files_in_paths(dropped_paths)
         total = len(all_source_files)
+        compiled_rules = self._compile_rules(category_name)
+        existing_names, devices = {}, {}
+        report_state = [0.0]
         self.logger.info(f"Starting Fast Move of {total} files to {dest_root}")
-        for i, old_path in enumerate(all_source_files):
-        # for i, old_path in enumerate(tqdm(all_source_files, desc="Fast Moving Files", unit="f", leave=False, ncols=80)):
-            progress_callback(f"Moving: {os.path.basename(old_path)}", i + 1, total)
-            filename, final_dest_path = os.path.basename(old_path), dest_root
-            for rule in self.rules:
-                if rule.get("category") == category_name and self.check_rule(rule, filename):
-                    action, value = rule.get("action"), rule.get("action_value")
-                    if action == "subfolder": final_dest_path = os.path.join(dest_root, value)
-                    elif action == "prefix": filename = f"{value}{filename}"
-                    break
-            new_path = os.path.join(final_dest_path, filename)
-            if os.path.exists(new_path):
-                base, ext = os.path.splitext(new_path); counter = 1
-                while os.path.exists(new_path): new_path = f"{base}_conflict_{counter}{ext}"; counter += 1
+        # Rules and name clashes are resolved for every file first, then the moves run as a batch
+        moves = []
+        for old_path in all_source_files:
+            final_dest_path, filename = self._apply_rules(compiled_rules, os.path.basename(old_path), dest_root)
+            new_path = self._free_path_in(final_dest_path, filename, "_conflict_", existing_names)
+            if not new_path.endswith(os.sep + filename): # Renamed by the clash check
                 self.logger.warn(f"Name conflict for '{filename}', renaming to '{os.path.basename(new_path)}'")
-            try: os.makedirs(os.path.dirname(new_path), exist_ok=True); shutil.move(old_path, new_path)
-            except Exception as e: self.logger.error(f"Failed to move {old_path}", exc_info=True)
+            moves.append((old_path, new_path))
+        self._move_files(progress_callback, moves, 0, total, report_state, devices)
         
         # source_dirs = {os.path.dirname(p) for p in all_source_files}
         # for folder in source_dirs:
@@ -3534,19 +4678,15 @@ class ParaFileManager(QMainWindow):
         #         if not os.listdir(folder): shutil.rmtree(folder)
         #     except Exception: pass
         self.logger.info("Cleaning up empty source directories...")
-        protected_paths = {os.path.normpath(os.path.join(self.base_dir, d)) for d in self.para_folders.values()}
-        source_dirs = {os.path.dirname(p) for p in all_source_files}
+        source_dirs = {os.path.normpath(os.path.dirname(p)) for p in all_source_files}
         
         for folder in sorted(source_dirs, key=len, reverse=True): # Process deeper folders first
-            try:
-                # Protect the main PARA folders from being deleted
-                if os.path.normpath(folder) in protected_paths:
-                    continue
-                if not os.listdir(folder):
-                    self.logger.info(f"Removing empty source directory: {folder}")
-                    shutil.rmtree(folder)
-            except Exception as e:
-                self.logger.warn(f"Could not remove source directory {folder}: {e}")
+            # Protect the main PARA folders from being deleted
+            if folder in self._protected_paths:
+                continue
+            try: os.rmdir(folder) # Only succeeds if the folder is empty
+            except OSError: continue
+            self.logger.info(f"Removed empty source directory: {folder}")
         return "Fast Move complete."
 
 
@@ -3602,13 +4742,6 @@ class ParaFileManager(QMainWindow):
     #         progress_callback(f"Moving: {os.path.basename(old_path)}", len(choices) + i, total)
     #         filename, final_dest_path = os.path.basename(old_path), dest_root
     #         # ... (This block of code for applying rules and moving is unchanged from your last version) ...
-    #         for rule in self.rules:
-    #             if rule.get("category") == category_name and self.check_rule(rule, filename):
-    #                 action, value = rule.get("action"), rule.get("action_value")
-    #                 if action == "subfolder": final_dest_path = os.path.join(dest_root, value)
-    #                 elif action == "prefix": filename = f"{value}{filename}"
-    #                 self.logger.info(f"Applying rule '{action}' to '{os.path.basename(old_path)}'", exc_info=True)
-    #                 break
     #         new_path = os.path.join(final_dest_path, filename)
     #         # Rename if it's a skipped duplicate or just a standard name conflict
     #         if os.path.exists(new_path):
@@ -3639,37 +4772,34 @@ class ParaFileManager(QMainWindow):
         self.logger.info(f"Starting final processing of {total} items to {dest_root}")
         
         processed_count = 0
-        
-        # Process duplicates based on user choices first
+        compiled_rules = self._compile_rules(category_name)
+        existing_names, devices = {}, {}
+        report_state = [0.0]
+        
+        # Recycle Bin choices are collected and trashed in one shell operation
+        to_trash = [p for p, choice in choices.items() if choice == "Move to Recycle Bin"]
+        if to_trash:
+            maybe_report(progress_callback, f"Sending {len(to_trash)} duplicate(s) to Recycle Bin", processed_count + 1, total, report_state)
+            self._trash_paths(to_trash)
+            processed_count += len(to_trash)
+
+        # Process the remaining duplicates based on user choices
         for old_path, choice in choices.items():
-            progress_callback(f"Handling: {os.path.basename(old_path)}", processed_count + 1, total)
-            processed_count += 1
-            
             if choice == "Move to Recycle Bin":
-                try:
-                    send2trash.send2trash(old_path)
-                    self.logger.info(f"Duplicate source sent to Recycle Bin: {old_path}")
-                except Exception as e:
-                    self.logger.error(f"Failed to send to Recycle Bin: {old_path}", exc_info=True)
-                continue # Skip to the next item
+                continue # Already handled above
+            maybe_report(progress_callback, f"Handling: {os.path.basename(old_path)}", processed_count + 1, total, report_state)
+            processed_count += 1
 
-            elif choice == "Move to '_duplicates' folder":
+            if choice == "Move to '_duplicates' folder":
                 try:
                     source_dir = os.path.dirname(old_path)
                     quarantine_dir = os.path.join(source_dir, "_duplicates")
                     os.makedirs(quarantine_dir, exist_ok=True)
                     
-                    base_name = os.path.basename(old_path)
-                    dest_path = os.path.join(quarantine_dir, base_name)
                     # Handle name conflicts within the quarantine folder
-                    if os.path.exists(dest_path):
-                        base, ext = os.path.splitext(base_name)
-                        counter = 1
-                        while os.path.exists(dest_path):
-                            dest_path = os.path.join(quarantine_dir, f"{base}_duplicate_{counter}{ext}")
-                            counter += 1
+                    dest_path = self._free_path_in(quarantine_dir, os.path.basename(old_path), "_duplicate_", existing_names)
                     
-                    shutil.move(old_path, dest_path)
+                    self._move_path(old_path, dest_path, devices)
                     self.logger.info(f"Duplicate source quarantined to: {dest_path}")
                 except Exception as e:
                     self.logger.error(f"Failed to quarantine file: {old_path}", exc_info=True)
@@ -3679,42 +4809,23 @@ class ParaFileManager(QMainWindow):
             # so we don't need to do anything here.
 
         # Now, process all non-duplicates and any "skipped" duplicates
+        moves = []
         for old_path in files_to_move:
-            progress_callback(f"Moving: {os.path.basename(old_path)}", processed_count + 1, total)
-            processed_count += 1
-            
-            filename, final_dest_path = os.path.basename(old_path), dest_root
-            for rule in self.rules:
-                if rule.get("category") == category_name and self.check_rule(rule, filename):
-                    action, value = rule.get("action"), rule.get("action_value")
-                    if action == "subfolder":
-                        final_dest_path = os.path.join(dest_root, value)
-                    elif action == "prefix":
-                        filename = f"{value}{filename}"
-                    break
-            
-            new_path = os.path.join(final_dest_path, filename)
-            if os.path.exists(new_path):
-                base, ext = os.path.splitext(new_path)
-                counter = 1
-                while os.path.exists(new_path):
-                    new_path = f"{base}_copy_{counter}{ext}"
-                    counter += 1
-            try:
-                os.makedirs(os.path.dirname(new_path), exist_ok=True)
-                shutil.move(old_path, new_path)
-            except Exception as e:
-                self.logger.error(f"Failed to move {old_path}", exc_info=True)
+            final_dest_path, filename = self._apply_rules(compiled_rules, os.path.basename(old_path), dest_root)
+            moves.append((old_path, self._free_path_in(final_dest_path, filename, "_copy_", existing_names)))
+        processed_count = self._move_files(progress_callback, moves, processed_count, total, report_state, devices)
 
         # Cleanup of empty source directories (remains the same)
         self.logger.info("Cleaning up empty source directories...")
         # ... (rest of the cleanup logic is unchanged) ...
         return "File processing complete."
 
-    def _task_rebuild_file_index(self, progress_callback):
+    def _task_rebuild_file_index(self, progress_callback, batch_callback=None, stop_event=None):
         """
         Walks the base directory to build an index of all files with their metadata.
-        This task runs in a background thread.
+        This task runs in a background thread. With a batch_callback the records are
+        streamed in INDEX_BATCH_SIZE chunks and None is returned. None is also
+        returned when stop_event is set before the walk finishes.
         """
         self.logger.info("Rebuilding file index...")
         progress_callback("Preparing to index...", 0, 1)
@@ -3722,32 +4833,162 @@ class ParaFileManager(QMainWindow):
         if not self.base_dir:
             return [] # Return an empty list if no base directory is set
 
-        all_paths = get_all_files_in_paths([self.base_dir])
-        total = len(all_paths)
+        # Each folder is one pool task, so listing and stat'ing overlap across folders instead of
+        # waiting on one syscall at a time; sub-folders are queued as their parent finishes.
         file_index_data = []
-
-        for i, path in enumerate(all_paths):
-            # Update progress periodically to avoid overwhelming the GUI thread
-            if (i + 1) % 100 == 0:
-                progress_callback(f"Indexing: {os.path.basename(path)}", i + 1, total)
-            
-            try:
-                stat = os.stat(path)
-                file_index_data.append({
-                    "path": path,
-                    "name_lower": os.path.basename(path).lower(),
-                    "size": stat.st_size,
-                    "mtime": stat.st_mtime, # Last modification time
-                    "ctime": stat.st_ctime  # Creation time (on Windows) or last metadata change (on Unix)
-                })
-            except (FileNotFoundError, PermissionError) as e:
-                self.logger.warn(f"Could not access file during indexing: {path} - {e}")
-                continue
+        report_state = [0.0]
+        total = 0
+        previous = self.file_index # Records of unchanged files are reused as they are
+        with ThreadPoolExecutor(max_workers=INDEX_WALK_WORKERS) as executor:
+            pending = {executor.submit(self._scan_index_dir, self.base_dir, previous, stop_event)}
+            while pending:
+                if stop_event and stop_event.is_set():
+                    for future in pending: future.cancel() # Folders already being listed still finish
+                    self.logger.info("Indexing stopped.")
+                    return None
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    dir_path, records, subdirs = future.result()
+                    pending.update(executor.submit(self._scan_index_dir, d, previous, stop_event) for d in subdirs)
+                    file_index_data.extend(records)
+                    total += len(records)
+                    if batch_callback and len(file_index_data) >= INDEX_BATCH_SIZE:
+                        batch_callback(file_index_data)
+                        file_index_data = []
+                    # Total is unknown while walking, so this shows a busy indicator
+                    maybe_report(progress_callback, f"Indexing: {os.path.basename(dir_path)}", total, 0, report_state)
         
         progress_callback("Finalizing index...", total, total)
-        self.logger.info(f"Indexing complete. Found {len(file_index_data)} items.")
+        self.logger.info(f"Indexing complete. Found {total} items.")
+        if batch_callback:
+            if file_index_data: batch_callback(file_index_data)
+            return None
         return file_index_data
     
+    def _scan_index_dir(self, dir_path, previous=None, stop_event=None):
+        """
+        Lists one folder for a full re-index: returns (dir_path, file records, sub-folder paths).
+        A record in `previous` whose size and times still match is returned instead of a new one.
+        A set stop_event cuts the listing short.
+        """
+        records, subdirs = [], []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if stop_event and stop_event.is_set():
+                        break
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif not entry.is_dir(): # Symlinked folders are skipped, as os.walk does
+                            records.append(self._make_index_entry(entry, previous))
+                    except (FileNotFoundError, PermissionError) as e:
+                        self.logger.warn(f"Could not access file during indexing: {entry.path} - {e}")
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return dir_path, records, subdirs
+
+    @staticmethod
+    def _make_index_entry(entry, previous=None):
+        """Builds one file index record from an os.DirEntry, reusing an unchanged one from `previous`."""
+        stat = entry.stat()
+        if previous and (old := previous.get(entry.path)) \
+                and old["mtime"] == stat.st_mtime and old["size"] == stat.st_size and old["ctime"] == stat.st_ctime:
+            return old
+        return {
+            "path": entry.path,
+            "name_lower": entry.name.lower(),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime, # Last modification time
+            "ctime": stat.st_ctime  # Creation time (on Windows) or last metadata change (on Unix)
+        }
+
+    def _update_index_for_directory(self, dir_path, recursive=False, index=None, dirs=None):
+        """
+        Re-scans a single folder and patches the file index with what changed there.
+        New sub-folders are walked, vanished ones are dropped. With recursive=True
+        the whole subtree below dir_path is re-walked instead. `dirs` is the
+        _IndexDirs of `index`; without an index the live one is patched.
+        """
+        if index is None:
+            index = self.file_index
+            if self._index_dirs is None:
+                self._index_dirs = _IndexDirs(index)
+            dirs = self._index_dirs
+            self._index_names_blob = None # Names may change, rebuild the search haystack
+            self._index_generation += 1
+        if not self.base_dir:
+            return
+        dir_path = os.path.normpath(dir_path)
+        if dir_path != self.base_dir and not dir_path.startswith(self.base_dir + os.sep):
+            return # Outside the PARA tree (e.g. the source folder of a drop)
+
+        def put(entry):
+            index[entry.path] = self._make_index_entry(entry)
+            dirs.add(entry.path)
+
+        def drop_subtree(folder):
+            for p in dirs.pop_subtree(folder):
+                index.pop(p, None)
+
+        if recursive or not os.path.isdir(dir_path):
+            drop_subtree(dir_path)
+            for entry in _iter_index(dir_path):
+                try: put(entry)
+                except OSError: continue
+            return
+
+        known_subdirs = set(dirs.subdirs.get(dir_path, ()))
+        known_files = set(dirs.files.get(dir_path, ()))
+        seen_files, seen_dirs = set(), set()
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            seen_dirs.add(entry.path)
+                            if entry.path not in known_subdirs:
+                                for sub in _iter_index(entry.path):
+                                    put(sub)
+                        elif not entry.is_dir():
+                            seen_files.add(entry.path)
+                            put(entry)
+                    except OSError:
+                        continue
+        except OSError as e:
+            self.logger.warn(f"Could not scan {dir_path} for index update: {e}")
+            return
+
+        for folder in known_subdirs - seen_dirs:
+            drop_subtree(folder)
+        for p in known_files - seen_files:
+            index.pop(p, None)
+            dirs.discard(p)
+
+    def _queue_index_update(self, paths=(), subtrees=()):
+        """
+        Records the folders an upcoming operation will touch, so that
+        on_final_refresh_finished can patch the index instead of rebuilding it.
+        """
+        for p in paths:
+            self._pending_index_dirs.setdefault(os.path.dirname(os.path.normpath(p)), False)
+        for d in subtrees:
+            self._pending_index_dirs[os.path.normpath(d)] = True
+
+    def _task_update_file_index(self, progress_callback, dirs):
+        """Patches a copy of the file index for the given folders. Runs in a background thread."""
+        index = dict(self.file_index)
+        index_dirs = _IndexDirs(index)
+        total = len(dirs)
+        report_state = [0.0]
+        for i, (dir_path, recursive) in enumerate(sorted(dirs.items())):
+            maybe_report(progress_callback, f"Updating index: {os.path.basename(dir_path)}", i + 1, total, report_state)
+            self._update_index_for_directory(dir_path, recursive, index, index_dirs)
+        self.logger.info(f"Index updated for {total} folder(s). {len(index)} items indexed.")
+        return index
+
     # --- ADD THIS NEW TASK FUNCTION TO THE ParaFileManager CLASS ---
     # Place it with the other _task_... methods.
 
@@ -3777,18 +5018,16 @@ class ParaFileManager(QMainWindow):
 
         try:
             progress_callback(f"Moving {base_name}...", 50, 100)
-            shutil.move(source_path, dest_path)
+            self._move_path(source_path, dest_path, {})
             self.logger.info(f"Successfully moved '{source_path}' to '{dest_path}'")
             progress_callback("Move complete.", 100, 100)
             
             source_dir = os.path.dirname(source_path)
-            protected_paths = {os.path.normpath(os.path.join(self.base_dir, d)) for d in self.para_folders.values()}
-            try:
-                if os.path.normpath(source_dir) not in protected_paths and not os.listdir(source_dir):
-                    self.logger.info(f"Cleaning up empty source directory from internal move: {source_dir}")
-                    shutil.rmtree(source_dir)
-            except Exception as e:
-                 self.logger.warn(f"Could not remove source directory {source_dir}: {e}")
+            if os.path.normpath(source_dir) not in self._protected_paths:
+                try:
+                    os.rmdir(source_dir) # Only succeeds if the folder is empty
+                    self.logger.info(f"Cleaned up empty source directory from internal move: {source_dir}")
+                except OSError: pass
                  
             return f"Moved '{base_name}' successfully."
         except Exception as e:
@@ -3796,15 +5035,21 @@ class ParaFileManager(QMainWindow):
             return f"Error moving {base_name}."
     # --- REPLACE your old 'handle_search' method with these TWO new methods ---
 
+    @pyqtSlot()
     def on_search_text_changed(self):
         """Restarts the debounce timer every time the user types."""
         # Check if the search term is a special command
         if self.search_bar.text().strip() == ":reindex":
             self.log_and_show("Manual re-index triggered!", "info")
-            self.run_task(self._task_rebuild_file_index, on_success=self.on_index_rebuilt)
+            self.start_index_rebuild()
+            return
+
+        # Typing a trailing space or changing case does not change the results
+        if self.search_bar.text().lower().strip() == self._last_search_term:
+            self.search_timer.stop()
             return
             
-        self.search_timer.start(300) # 300ms for search, 3000ms for file changes
+        self.search_timer.start(self.SEARCH_DEBOUNCE_MS) # Debounced search, 3000ms for file changes
     
     
     # --- REPLACE the _load_para_icons method ---
@@ -3812,7 +5057,6 @@ class ParaFileManager(QMainWindow):
     def _load_para_icons(self, custom_icon_paths):
         """Loads icons from paths or built-in identifiers, with fallbacks."""
         self.para_category_icons = {}
-        style = self.style()
         default_enums = {
             "Projects": QStyle.StandardPixmap.SP_FileDialogNewFolder,
             "Areas": QStyle.StandardPixmap.SP_DriveHDIcon,
@@ -3827,7 +5071,7 @@ class ParaFileManager(QMainWindow):
                 if value.startswith("SP_"): # Handle built-in icon identifier
                     try:
                         enum = getattr(QStyle.StandardPixmap, value)
-                        self.para_category_icons[category] = style.standardIcon(enum)
+                        self.para_category_icons[category] = standard_icon(enum)
                         loaded_successfully = True
                     except AttributeError:
                         self.logger.warn(f"Invalid built-in icon identifier '{value}' for {category}. Using default.")
@@ -3837,10 +5081,16 @@ class ParaFileManager(QMainWindow):
                         self.para_category_icons[category] = QIcon(pixmap)
                         loaded_successfully = True
                     else:
-                        self.logger.warn(f"Failed to load custom icon for {category} from path: {path}. Using default.")
+                        self.logger.warn(f"Failed to load custom icon for {category} from path: {value}. Using default.")
             
             if not loaded_successfully:
-                self.para_category_icons[category] = style.standardIcon(default_enum)
+                self.para_category_icons[category] = standard_icon(default_enum)
+
+        # Scaled once here: painting a QIcon built from a large image rescales it on every call
+        self.para_category_pixmaps = {
+            category: {size: icon.pixmap(QSize(size, size)) for size in (DROP_FRAME_ICON_SIZE, SearchResultDelegate.CATEGORY_ICON_SIZE)}
+            for category, icon in self.para_category_icons.items()
+        }
 
     # --- ADD these THREE new methods for pagination logic ---
 
@@ -3896,6 +5146,7 @@ class ParaFileManager(QMainWindow):
     def perform_search(self):
         """Performs a search based on the user's input."""
         term = self.search_bar.text().lower().strip()
+        self._last_search_term = term
         
         # If the search bar is empty, just show the file tree
         if not term:
@@ -3909,17 +5160,62 @@ class ParaFileManager(QMainWindow):
         # --- Perform the search ---
         self.bottom_pane.setCurrentIndex(2) # Switch to the search results page
         if self.file_index:
-            self.current_search_results = [item for item in self.file_index if term in item["name_lower"]]
+            self.current_search_results = self._search_index_names(term)
         else:
             self.current_search_results = []
             
         self.current_search_page = 0
         self.display_search_page()
 
-    def display_search_page(self):
-        """Renders the current page of search results into the list widget."""
-        self.search_results_list.clear()
+    def _search_index_names(self, term):
+        """
+        Substring search over all indexed names. The lowercase names are joined
+        into one string once, so matching is a handful of str.find calls in C
+        instead of a Python loop over every entry.
+        """
+        if self._index_names_blob is None:
+            self._index_items = list(self.file_index.values())
+            self._index_offsets = []
+            pos = 0
+            for item in self._index_items:
+                self._index_offsets.append(pos)
+                pos += len(item["name_lower"]) + 1
+            self._index_names_blob = "\n".join(item["name_lower"] for item in self._index_items)
+            self._narrow_cache = None # Earlier results refer to the old index
+            self._search_cache.clear()
+
+        # Going back to a recent query (e.g. deleting the last typed character) reuses its hits
+        if (results := self._search_cache.get(term)) is not None:
+            self._search_cache.move_to_end(term)
+            self._narrow_cache = (term, results)
+            return results
+
+        # Typing more characters can only shrink the result set, so filter the previous hits
+        if self._narrow_cache and self._narrow_cache[0] in term:
+            results = [item for item in self._narrow_cache[1] if term in item["name_lower"]]
+            self._narrow_cache = (term, results)
+            self._remember_search(term, results)
+            return results
+
+        blob, offsets, items = self._index_names_blob, self._index_offsets, self._index_items
+        results = []
+        pos = 0
+        while (pos := blob.find(term, pos)) != -1:
+            i = bisect_right(offsets, pos) - 1
+            results.append(items[i])
+            # Continue from the next name so each entry is reported once
+            pos = offsets[i + 1] if i + 1 < len(offsets) else len(blob)
+        self._narrow_cache = (term, results)
+        self._remember_search(term, results)
+        return results
+
+    def _remember_search(self, term, results):
+        self._search_cache[term] = results
+        if len(self._search_cache) > SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
 
+    def display_search_page(self):
+        """Hands the current page of search results to the list model."""
         start_index = self.current_search_page * self.RESULTS_PER_PAGE
         end_index = start_index + self.RESULTS_PER_PAGE
         page_items = self.current_search_results[start_index:end_index]
@@ -3932,91 +5228,10 @@ class ParaFileManager(QMainWindow):
         self.prev_page_button.setEnabled(self.current_search_page > 0)
         self.next_page_button.setEnabled(end_index < total_results)
         
-        file_icon_provider = QFileIconProvider()
-        para_icons = {name: icon.pixmap(40, 40) for name, icon in self.para_category_icons.items()}
-
-        for item_data in page_items:
-            path = item_data["path"]
-            item_widget = QWidget()
-            main_layout = QHBoxLayout(item_widget)
-            main_layout.setContentsMargins(8, 8, 8, 8)
-            main_layout.setSpacing(12)
-
-            file_type_icon = file_icon_provider.icon(QFileInfo(path))
-            file_type_label = QLabel()
-            file_type_label.setPixmap(file_type_icon.pixmap(QSize(32, 32)))
-            
-            details_layout = QVBoxLayout()
-            details_layout.setSpacing(2)
-            
-            filename_label = QLabel(f"<span id='SearchResultName'>{os.path.basename(path)}</span>")
-            
-            path_layout = QHBoxLayout()
-            path_layout.setSpacing(5)
-            
-            rel_path = os.path.relpath(os.path.dirname(path), self.base_dir)
-            path_parts = rel_path.split(os.sep)
-            root_folder = path_parts[0]
-            sub_path = os.path.join(*path_parts[1:]) if len(path_parts) > 1 else ""
-
-            category_name = self.folder_to_category.get(root_folder)
-            if category_name and category_name in para_icons:
-                root_icon_label = QLabel()
-                root_icon_label.setPixmap(para_icons[category_name])
-                path_layout.addWidget(root_icon_label)
-                path_layout.addWidget(QLabel("▶"))
-                path_text = sub_path
-            else:
-                path_text = rel_path
-            
-            
-            
-            
-            
-
-
-            try:
-                # Check if drives are the same before creating a relative path
-                path_drive = os.path.splitdrive(path)[0]
-                base_drive = os.path.splitdrive(self.base_dir)[0]
-                if path_drive.lower() == base_drive.lower():
-                    rel_path = os.path.relpath(os.path.dirname(path), self.base_dir)
-                else:
-                    # Fallback for different drives: show the absolute directory
-                    rel_path = os.path.dirname(path)
-            except ValueError:
-                # General fallback in case of other path errors
-                rel_path = os.path.dirname(path)
-                
-                
-                
-
-            display_path = path_text.replace(os.sep, "  ▶  ")
-            path_label = QLabel(f"<span id='SearchResultPath'>{display_path}</span>")
-            
-            path_layout.addWidget(path_label)
-            path_layout.addStretch()
-
-            details_layout.addWidget(filename_label)
-            details_layout.addLayout(path_layout)
-            
-            formatted_size = format_size(item_data['size'])
-            mtime_str = datetime.fromtimestamp(item_data['mtime']).strftime('%Y-%m-%d %H:%M')
-            meta_html = f"<div style='text-align: right; font-size: 9pt;'>{formatted_size} <br><span style='color: #98c379;'>Modified: {mtime_str}</span></div>"
-            meta_label = QLabel(meta_html)
-            meta_label.setFixedWidth(160)
-            meta_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            
-            main_layout.addWidget(file_type_label)
-            main_layout.addLayout(details_layout, 1)
-            main_layout.addWidget(meta_label)
-            
-            list_item = QListWidgetItem(self.search_results_list)
-            list_item.setData(Qt.ItemDataRole.UserRole, path)
-            list_item.setSizeHint(item_widget.sizeHint())
-            self.search_results_list.addItem(list_item)
-            self.search_results_list.setItemWidget(list_item, item_widget)
+        self.search_results_model.set_results(page_items, self.base_dir, self.folder_to_category)
+        self.search_results_list.scrollToTop()
             
+    @pyqtSlot()
     def go_to_next_page(self):
         """Moves to the next page of search results."""
         total_pages = (len(self.current_search_results) + self.RESULTS_PER_PAGE - 1) // self.RESULTS_PER_PAGE
@@ -4024,6 +5239,7 @@ class ParaFileManager(QMainWindow):
             self.current_search_page += 1
             self.display_search_page()
 
+    @pyqtSlot()
     def go_to_previous_page(self):
         """Moves to the previous page of search results."""
         if self.current_search_page > 0:
@@ -4242,6 +5458,7 @@ class ParaFileManager(QMainWindow):
 
             # Save the successful destination to history BEFORE running the task
             self._save_move_to_history(destination_dir)
+            self._queue_index_update(source_paths, [destination_dir])
 
             self.run_task(
                 self._task_move_multiple_items,
@@ -4252,12 +5469,9 @@ class ParaFileManager(QMainWindow):
             
     def get_category_from_path(self, path):
         if not self.base_dir: return None
-        norm_path = os.path.normpath(path)
-        for cat_name, folder_name in self.para_folders.items():
-            cat_path = os.path.join(self.base_dir, folder_name)
-            if norm_path == cat_path or norm_path.startswith(cat_path + os.sep):
-                return cat_name
-        return None
+        # Appending the separator makes the category folder itself match its own prefix
+        norm_path = os.path.normpath(path) + os.sep
+        return next((cat_name for cat_name, cat_prefix in self._category_paths if norm_path.startswith(cat_prefix)), None)
             
     # --- REPLACE your show_context_menu method with this one ---
 
@@ -4271,17 +5485,17 @@ class ParaFileManager(QMainWindow):
 # --- ADD a new handler for the search results list ---
 
     def show_search_result_context_menu(self, pos):
-        item = self.search_results_list.itemAt(pos)
-        if not item: return
-        path = item.data(Qt.ItemDataRole.UserRole) # Get path from item data
+        index = self.search_results_list.indexAt(pos)
+        if not index.isValid(): return
+        path = index.data(Qt.ItemDataRole.UserRole) # Get path from the model
         if not path: return
         menu = self._build_context_menu(path)
-        menu.exec(self.search_results_list.mapToGlobal(pos))
+        menu.exec(self.search_results_list.viewport().mapToGlobal(pos))
 
-    def open_selected_item(self, item_or_index):
-        path = ""
-        if isinstance(item_or_index, QListWidgetItem): path = item_or_index.data(Qt.ItemDataRole.UserRole)
-        elif isinstance(item_or_index, QModelIndex): path = self.file_system_model.filePath(item_or_index)
+    @pyqtSlot(QModelIndex)
+    def open_selected_item(self, index):
+        if index.model() is self.search_results_model: path = index.data(Qt.ItemDataRole.UserRole)
+        else: path = self.file_system_model.filePath(index)
         if path: self.open_item(path)
 
     def open_item(self, path):
@@ -4318,7 +5532,10 @@ class ParaFileManager(QMainWindow):
         """Re-enables the file system watcher after an operation is complete."""
         if self.base_dir:
             self.logger.info("Re-enabling file system watcher.")
-            self.setup_file_watcher() # This already has the logic to add all paths
+            if self._watch_root != self.base_dir or not self._watched_dirs:
+                self.setup_file_watcher() # First run or a new base directory: walk the whole tree
+            else:
+                self._refresh_watched_directories()
     def handle_move_to_category(self, source_path, category_name):
         """
         Handles the logic for moving an item to a selected PARA category.
@@ -4340,6 +5557,7 @@ class ParaFileManager(QMainWindow):
 
         if destination_dir: # User selected a directory and clicked OK
             self.log_and_show(f"Moving '{os.path.basename(source_path)}'...", "info")
+            self._queue_index_update([source_path], [destination_dir])
             self.run_task(
                 self._task_move_item,
                 on_success=self.on_final_refresh_finished,
@@ -4367,13 +5585,15 @@ class ParaFileManager(QMainWindow):
 
     def rename_item(self, index):
         if not index.isValid():
-            # This can happen if the context menu was triggered from the search list
-            # where we don't have a direct index. We get the path from the item data instead.
-            # For simplicity, we'll only support rename from the tree view for now.
-            QMessageBox.information(self, "Info", "Rename is only available by right-clicking directly on an item in the main file tree.")
+            QMessageBox.information(self, "Info", "Rename is only available by right-clicking directly on an item.")
             return
+        self.rename_item_by_path(self.file_system_model.filePath(index))
 
-        old_path = self.file_system_model.filePath(index)
+    def rename_item_by_path(self, old_path):
+        """Renames a file/folder. Works from a plain path, so it does not depend on model rows staying put."""
+        if not old_path or not os.path.exists(old_path):
+            self.log_and_show(f"ERROR: '{os.path.basename(old_path)}' no longer exists.", "error")
+            return
         old_filename = os.path.basename(old_path)
         
         new_filename, ok = QInputDialog.getText(self, "Rename", "New name:", text=old_filename)
@@ -4383,6 +5603,10 @@ class ParaFileManager(QMainWindow):
                 os.rename(old_path, new_path)
                 self.log_and_show(f"Renamed to '{new_filename}'", "info")
                 self.logger.info(f"Renamed {old_path} to {new_path}")
+                self.file_system_model.refresh_directory(os.path.dirname(old_path))
+                self._update_index_for_directory(os.path.dirname(old_path))
+                if self.search_bar.text().strip():
+                    self.perform_search()
                 # A full re-index isn't needed, the model should update.
                 # self.run_task(self._task_rebuild_file_index, on_success=self.on_final_refresh_finished)
 
@@ -4416,6 +5640,7 @@ class ParaFileManager(QMainWindow):
                 return
             try:
                 os.makedirs(new_path)
+                self.file_system_model.refresh_directory(target_dir)
                 self.log_and_show(f"Folder '{new_folder_name}' created.", "info")
             except Exception as e:
                 self.log_and_show(f"Could not create folder: {e}", "error")
@@ -4433,6 +5658,7 @@ class ParaFileManager(QMainWindow):
                 # Create an empty file
                 with open(new_path, 'w') as f:
                     pass
+                self.file_system_model.refresh_directory(target_dir)
                 self.log_and_show(f"File '{new_file_name}' created.", "info")
             except Exception as e:
                 self.log_and_show(f"Could not create file: {e}", "error")
@@ -4461,6 +5687,7 @@ class ParaFileManager(QMainWindow):
                 return
             folder_handling_mode = dialog.result
         
+        self._queue_index_update(dropped_paths, [dest_root])
         self._disable_watcher() # <<< FIX: Disable watcher before starting tasks
 
         if folder_handling_mode == "move_as_is":
@@ -4485,10 +5712,11 @@ class ParaFileManager(QMainWindow):
                     self._enable_watcher() # <<< FIX: Re-enable watcher on cancellation
                     return
                 
-                files_to_hash_dest = hash_dialog.get_checked_files()
+                # The checked files are listed in the task; walking the destination here would freeze the UI
+                dest_selection = hash_dialog.get_checked_selection()
                 on_scan_completed_with_context = partial(self.on_scan_completed, dest_root=dest_root, category_name=category_name)
                 self.run_task(self._task_scan_for_duplicates, on_success=on_scan_completed_with_context,
-                              source_paths=dropped_paths, files_to_hash_dest=files_to_hash_dest)
+                              source_paths=dropped_paths, dest_selection=dest_selection)
         else:
             self.run_task(self._task_process_simple_drop, on_success=self.on_final_refresh_finished,
                           dropped_paths=dropped_paths, dest_root=dest_root, category_name=category_name)
@@ -4497,26 +5725,71 @@ class ParaFileManager(QMainWindow):
 # --- REPLACE the delete_item method in ParaFileManager ---
 
     def delete_item(self, index):
-        path = self.file_system_model.filePath(index)
-        filename = os.path.basename(path)
-        if not os.path.exists(path):
-            self.log_and_show(f"ERROR: '{filename}' no longer exists.", "error")
+        self.delete_item_by_path(self.file_system_model.filePath(index))
+
+    def delete_item_by_path(self, path):
+        # If the clicked item is part of a multi-selection, delete the whole selection at once
+        selected = {self.file_system_model.filePath(i) for i in self.tree_view.selectionModel().selectedIndexes() if i.column() == 0}
+        self.delete_items(sorted(selected) if path in selected and len(selected) > 1 else [path])
+
+    def delete_items(self, paths):
+        """Asks once for the whole batch, then trashes everything in a single background task."""
+        paths = [os.path.normpath(p) for p in paths if p]
+        # Trashing a folder already covers anything selected inside it
+        paths = [p for p in paths if not any(p.startswith(other + os.sep) for other in paths)]
+        existing = [p for p in paths if os.path.exists(p)]
+        for missing in set(paths) - set(existing):
+            self.log_and_show(f"ERROR: '{os.path.basename(missing)}' no longer exists.", "error")
+        if not existing:
             return
-        
-        reply = QMessageBox.warning(self, "Confirm Delete", f"Move this item to the Recycle Bin?\n\n'{filename}'",
+
+        if len(existing) == 1:
+            question = f"Move this item to the Recycle Bin?\n\n'{os.path.basename(existing[0])}'"
+        else:
+            names = "\n".join(f"'{os.path.basename(p)}'" for p in existing[:10])
+            if len(existing) > 10:
+                names += f"\n... and {len(existing) - 10} more"
+            question = f"Move these {len(existing)} items to the Recycle Bin?\n\n{names}"
+        reply = QMessageBox.warning(self, "Confirm Delete", question,
                                       QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
+            self._disable_watcher() # on_final_refresh_finished re-enables it
+            self._queue_index_update(existing)
+            self.run_task(self._task_bulk_trash, on_success=self.on_final_refresh_finished, paths=existing)
+
+    def _trash_paths(self, paths, progress_callback=None):
+        """Sends paths to the Recycle Bin in one call, retrying one by one if the batch fails. Returns the failure count."""
+        try:
+            # One shell operation for the whole batch instead of one per path
+            send2trash.send2trash(list(paths))
+            for path in paths:
+                self.logger.info(f"Trashed {path}")
+            return 0
+        except Exception:
+            self.logger.error(f"Batch trash of {len(paths)} item(s) failed, retrying individually", exc_info=True)
+        total, failed = len(paths), 0
+        report_state = [0.0]
+        for i, path in enumerate(paths):
+            if progress_callback:
+                maybe_report(progress_callback, f"Trashing: {os.path.basename(path)}", i + 1, total, report_state)
+            if not os.path.lexists(path):
+                continue # Trashed before the batch call failed
             try:
-                self._disable_watcher() # <<< FIX: Disable watcher
                 send2trash.send2trash(path)
-                self.log_and_show(f"Moved '{filename}' to Recycle Bin", "info")
                 self.logger.info(f"Trashed {path}")
-                # The refresh task will re-enable the watcher in its callback
-                self.run_task(self._task_rebuild_file_index, on_success=self.on_index_rebuilt)
             except Exception as e:
-                self.log_and_show("Could not move to Recycle Bin.", "error")
+                failed += 1
                 self.logger.error(f"Failed to trash {path}", exc_info=True)
-                self._enable_watcher() # <<< FIX: Re-enable on error
+        return failed
+
+    def _task_bulk_trash(self, progress_callback, paths):
+        """Sends a batch of files/folders to the Recycle Bin."""
+        total = len(paths)
+        progress_callback(f"Trashing {total} item(s)...", 0, total)
+        failed = self._trash_paths(paths, progress_callback)
+        if failed:
+            return f"Moved {total - failed} of {total} item(s) to Recycle Bin. {failed} failed, see log."
+        return f"Moved {total} item(s) to Recycle Bin."
                      
     # def delete_item(self, index):
     #     path = self.file_system_model.filePath(index)
@@ -4537,17 +5810,125 @@ class ParaFileManager(QMainWindow):
     #             self.log_and_show("Could not move to Recycle Bin.", "error")
     #             self.logger.error(f"Failed to trash {path}", exc_info=True)
 
-    def check_rule(self, rule, filename):
-        cond_type = rule.get("condition_type")
-        cond_val = rule.get("condition_value", "").lower()
-        if not cond_val: return False
-        
+    def _compile_rules(self, category_name):
+        """
+        Prepares the rules of one category once per configuration load, so the
+        per-file loop does no lowercasing or splitting. Keeps the order of self.rules.
+        Returns a list of (extensions_tuple, keyword, action, action_value).
+        """
+        if (compiled := self._rules_by_category.get(category_name)) is not None:
+            return compiled
+        compiled = []
+        for rule in self.rules:
+            if rule.get("category") != category_name:
+                continue
+            cond_val = rule.get("condition_value", "").lower()
+            if not cond_val:
+                continue
+            cond_type = rule.get("condition_type")
+            if cond_type == "extension":
+                exts = tuple(ext.strip() for ext in cond_val.split(',') if ext.strip())
+                if exts:
+                    compiled.append((exts, None, rule.get("action"), rule.get("action_value")))
+            elif cond_type == "keyword":
+                compiled.append((None, cond_val, rule.get("action"), rule.get("action_value")))
+        self._rules_by_category[category_name] = compiled
+        return compiled
+
+    def _free_path_in(self, dest_dir, filename, suffix, existing_names):
+        """
+        Returns a path in dest_dir that does not clash with an existing entry, adding
+        f"{suffix}{n}" before the extension if needed. Each folder is listed once per
+        task into existing_names ({dir: set of names}), so clash checks are set lookups
+        instead of an os.path.exists() call per candidate name.
+        """
+        fold = str.lower if CASE_INSENSITIVE_FS else str
+        names = existing_names.get(dest_dir)
+        if names is None:
+            try:
+                with os.scandir(dest_dir) as it:
+                    names = {fold(entry.name) for entry in it}
+            except OSError:
+                names = set() # Folder does not exist yet
+            existing_names[dest_dir] = names
+
+        candidate = filename
+        if fold(candidate) in names:
+            base, ext = os.path.splitext(filename)
+            counter = 1
+            while fold(candidate := f"{base}{suffix}{counter}{ext}") in names:
+                counter += 1
+        names.add(fold(candidate))
+        return os.path.join(dest_dir, candidate)
+
+    def _move_path(self, src, dst, devices):
+        """
+        Moves src to dst. When both folders are on the same device this is a single
+        os.rename(); otherwise shutil.move() copies and deletes. `devices` caches
+        st_dev per folder for the duration of a task. A rename that still crosses a
+        mount (e.g. bind mounts sharing st_dev) fails with EXDEV and falls back too.
+        """
+        if self._same_device(src, dst, devices):
+            try:
+                os.rename(src, dst)
+                return
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+        shutil.move(src, dst)
+
+    @staticmethod
+    def _same_device(src, dst, devices):
+        """True when the folders of src and dst are known to be on one device."""
+        def device_of(folder):
+            if folder not in devices:
+                try: devices[folder] = os.stat(folder).st_dev
+                except OSError: devices[folder] = None
+            return devices[folder]
+
+        src_dev = device_of(os.path.dirname(src))
+        return src_dev is not None and src_dev == device_of(os.path.dirname(dst))
+
+    def _move_files(self, progress_callback, moves, done, total, report_state, devices):
+        """
+        Performs planned (src, dst) moves, counting progress on from `done`. Each
+        destination folder is created once. Same-device moves are single renames and
+        run inline; moves that copy across devices run on a pool so the copies overlap.
+        """
+        for folder in {os.path.dirname(dst) for _, dst in moves}:
+            try: os.makedirs(folder, exist_ok=True)
+            except OSError as e: self.logger.error(f"Could not create {folder}: {e}") # Its moves fail below
+
+        def move(src, dst):
+            try: self._move_path(src, dst, devices)
+            except Exception: self.logger.error(f"Failed to move {src}", exc_info=True)
+            return src
+
+        copies = []
+        with ThreadPoolExecutor(max_workers=MOVE_COPY_WORKERS) as executor:
+            for src, dst in moves:
+                if not self._same_device(src, dst, devices):
+                    copies.append(executor.submit(move, src, dst))
+                    continue
+                done += 1
+                maybe_report(progress_callback, f"Moving: {os.path.basename(src)}", done, total, report_state)
+                move(src, dst)
+            for future in as_completed(copies):
+                done += 1
+                maybe_report(progress_callback, f"Copied: {os.path.basename(future.result())}", done, total, report_state)
+        return done
+
+    def _apply_rules(self, compiled_rules, filename, dest_root):
+        """Applies the first matching compiled rule. Returns (destination folder, filename)."""
         filename_lower = filename.lower()
-        if cond_type == "extension":
-            return any(filename_lower.endswith(ext.strip()) for ext in cond_val.split(',') if ext.strip())
-        elif cond_type == "keyword":
-            return cond_val in filename_lower
-        return False
+        for exts, keyword, action, value in compiled_rules:
+            if filename_lower.endswith(exts) if exts else keyword in filename_lower:
+                if action == "subfolder":
+                    return os.path.join(dest_root, value), filename
+                if action == "prefix":
+                    return dest_root, f"{value}{filename}"
+                break
+        return dest_root, filename
     
     
     #--- ADD THIS NEW TASK FUNCTION TO THE ParaFileManager CLASS ---
@@ -4558,10 +5939,14 @@ class ParaFileManager(QMainWindow):
         Applies rules to files, but not to directories. Handles name conflicts for both.
         """
         total = len(dropped_paths)
+        compiled_rules = self._compile_rules(category_name)
+        existing_names, devices = {}, {}
+        report_state = [0.0]
         self.logger.info(f"Starting Hybrid Move of {total} items to {dest_root}")
         
         for i, path in enumerate(dropped_paths):
-            progress_callback(f"Moving: {os.path.basename(path)}", i + 1, total)
+            name = os.path.basename(path)
+            maybe_report(progress_callback, f"Moving: {name}", i + 1, total, report_state)
             
             # Check if the path (still) exists before processing
             if not os.path.exists(path):
@@ -4570,70 +5955,45 @@ class ParaFileManager(QMainWindow):
 
             # --- Handle Directories ---
             if os.path.isdir(path):
-                dir_name = os.path.basename(path)
-                final_dest_path = os.path.join(dest_root, dir_name)
-
                 # Handle name conflicts for directories
-                if os.path.exists(final_dest_path):
-                    base, ext = os.path.splitext(final_dest_path) # Use splitext to handle folders with dots
-                    counter = 1
-                    while os.path.exists(final_dest_path):
-                        final_dest_path = f"{base}_conflict_{counter}{ext}"
-                        counter += 1
-                    self.logger.warn(f"Conflict: Directory '{dir_name}' will be moved as '{os.path.basename(final_dest_path)}'")
+                final_dest_path = self._free_path_in(dest_root, name, "_conflict_", existing_names)
+                if not final_dest_path.endswith(os.sep + name): # Renamed by the clash check
+                    self.logger.warn(f"Conflict: Directory '{name}' will be moved as '{os.path.basename(final_dest_path)}'")
                 
                 try:
-                    shutil.move(path, final_dest_path)
+                    self._move_path(path, final_dest_path, devices)
                     self.logger.info(f"Moved directory {path} to {final_dest_path}")
                 except Exception as e:
+                    existing_names.pop(dest_root, None)
                     self.logger.error(f"Failed to move directory {path}", exc_info=True)
                 continue
 
             # --- Handle Files (existing logic) ---
             if os.path.isfile(path):
-                filename = os.path.basename(path)
-                final_dest_dir = dest_root
-                
                 # Apply rules to files
-                for rule in self.rules:
-                    if rule.get("category") == category_name and self.check_rule(rule, filename):
-                        action, value = rule.get("action"), rule.get("action_value")
-                        if action == "subfolder":
-                            final_dest_dir = os.path.join(dest_root, value)
-                        elif action == "prefix":
-                            filename = f"{value}{filename}"
-                        break
+                final_dest_dir, filename = self._apply_rules(compiled_rules, name, dest_root)
                 
-                new_path = os.path.join(final_dest_dir, filename)
-
                 # Handle name conflicts for files
-                if os.path.exists(new_path):
-                    base, ext = os.path.splitext(new_path)
-                    counter = 1
-                    while os.path.exists(new_path):
-                        new_path = f"{base}_conflict_{counter}{ext}"
-                        counter += 1
+                new_path = self._free_path_in(final_dest_dir, filename, "_conflict_", existing_names)
+                if not new_path.endswith(os.sep + filename): # Renamed by the clash check
                     self.logger.warn(f"Conflict: File '{filename}' will be moved as '{os.path.basename(new_path)}'")
 
                 try:
-                    os.makedirs(os.path.dirname(new_path), exist_ok=True)
-                    shutil.move(path, new_path)
+                    os.makedirs(final_dest_dir, exist_ok=True)
+                    self._move_path(path, new_path, devices)
                 except Exception as e:
+                    existing_names.pop(final_dest_dir, None)
                     self.logger.error(f"Failed to move file {path}", exc_info=True)
         
         self.logger.info("Cleaning up empty source directories...")
-        protected_paths = {os.path.normpath(os.path.join(self.base_dir, d)) for d in self.para_folders.values()}
-        source_dirs = {os.path.dirname(p) for p in dropped_paths}
+        source_dirs = {os.path.normpath(os.path.dirname(p)) for p in dropped_paths}
         
         for folder in sorted(source_dirs, key=len, reverse=True):
-            try:
-                if os.path.normpath(folder) in protected_paths:
-                    continue
-                if not os.listdir(folder):
-                    self.logger.info(f"Removing empty source directory: {folder}")
-                    shutil.rmtree(folder)
-            except Exception as e:
-                self.logger.warn(f"Could not remove source directory {folder}: {e}")
+            if folder in self._protected_paths:
+                continue
+            try: os.rmdir(folder) # Only succeeds if the folder is empty
+            except OSError: continue
+            self.logger.info(f"Removed empty source directory: {folder}")
 
         return "Hybrid move complete."
     
@@ -4684,8 +6044,9 @@ class ParaFileManager(QMainWindow):
         os.makedirs(cleanup_folder_path, exist_ok=True)
 
         affected_dirs = set()
+        report_state = [0.0]
         for i, path in enumerate(files_to_trash):
-            progress_callback(f"Preparing: {os.path.basename(path)}", i + 1, total)
+            maybe_report(progress_callback, f"Preparing: {os.path.basename(path)}", i + 1, total, report_state)
             try:
                 if os.path.exists(path):
                     # 2. Move each file into the consolidation folder
@@ -4884,25 +6245,21 @@ class ParaFileManager(QMainWindow):
         # --- Advanced Algorithm: Data Pre-processing ---
         self.logger.info("Scan found duplicates. Pre-processing results for analytics dialog...")
         processed_sets = []
-        for hash_val, paths in duplicate_sets.items():
-            if not paths: continue
+        for hash_val, entries in duplicate_sets.items():
+            if not entries: continue
             
             try:
-                # 1. Calculate group-level metrics
-                file_size_bytes = os.path.getsize(paths[0])
-                count = len(paths)
+                # 1. Calculate group-level metrics (entries are (path, mtime, size) from the scan)
+                file_size_bytes = entries[0][2]
+                count = len(entries)
                 total_space_bytes = file_size_bytes * count
                 potential_savings_bytes = file_size_bytes * (count - 1)
 
                 # 2. Score and sort individual files within the group
                 scored_files = []
-                for path in paths:
-                    try:
-                        score, reason = self._calculate_retention_score(path)
-                        mod_time = os.path.getmtime(path)
-                        scored_files.append({"path": path, "score": score, "reason": reason, "mtime": mod_time})
-                    except FileNotFoundError:
-                        continue
+                for path, mod_time, _ in entries:
+                    score, reason = self._calculate_retention_score(path)
+                    scored_files.append({"path": path, "score": score, "reason": reason, "mtime": mod_time})
                 
                 if not scored_files: continue
 
@@ -4935,6 +6292,7 @@ class ParaFileManager(QMainWindow):
             files_to_trash = dialog.get_files_to_trash()
             if files_to_trash:
                 self._disable_watcher()
+                self._queue_index_update(files_to_trash)
                 self.run_task(
                     self._task_process_scan_results,
                     on_success=self.on_final_refresh_finished,
@@ -4956,13 +6314,6 @@ class ParaFileManager(QMainWindow):
         except Exception as e:
             self.logger.error(f"Failed to open log viewer: {e}", exc_info=True)
             
-    # def open_settings_dialog(self):
-    #     dialog = SettingsDialog(self)
-    #     dialog.setWindowIcon(self.windowIcon())
-    #     if dialog.exec():
-    #         self.log_and_show("Settings saved. Reloading configuration...", "info")
-    #         self.reload_configuration()
-    
     def open_settings_dialog(self):
         # Pass the current icons to the dialog to ensure previews are correct
         dialog = SettingsDialog(self.para_category_icons, self)
@@ -5003,7 +6354,7 @@ class ParaFileManager(QMainWindow):
         if dedup_dialog.exec():
             # User confirmed, run the final processing task
             user_choices = dedup_dialog.get_user_choices()
-            files_to_process = [p for p, _, _ in duplicates if p not in user_choices] + \
+            files_to_process = [p for p, _, _, _ in duplicates if p not in user_choices] + \
                                [p for p, choice in user_choices.items() if choice == "Skip (Move and Rename)"]
 
             self.run_task(self._task_process_final_drop, 
@@ -5058,8 +6409,7 @@ class ParaFileManager(QMainWindow):
     def _load_scan_rules(self):
         """Loads the scan exclusion rules from the user data directory."""
         try:
-            with open(self.scan_rules_path, "r", encoding="utf-8") as f:
-                self.scan_rules = json.load(f)
+            self.scan_rules = load_json(self.scan_rules_path)
             self.logger.info("Successfully loaded developer-aware scan rules.")
         except (FileNotFoundError, json.JSONDecodeError) as e:
             self.logger.warn(f"scan_rules.json not found or invalid. Using empty rules. Error: {e}")
@@ -5068,16 +6418,14 @@ class ParaFileManager(QMainWindow):
     def _save_config(self):
         """Saves the current configuration back to the persistent config.json."""
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f_read:
-                config = json.load(f_read)
+            config = load_json(self.config_path)
         except (FileNotFoundError, json.JSONDecodeError):
             config = {}
         
         config["move_to_history"] = self.move_to_history
         # Add any other settings that need to be saved here
         
-        with open(self.config_path, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=4)
+        save_json(self.config_path, config)
             
             
     # def _save_config(self):
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+pytest.importorskip("PyQt6")
+from para_manager import add_new_subdirs
+
+
+def test_new_subdirs_of_several_changed_folders_are_all_watched(tmp_path):
+    root = str(tmp_path)
+    a, b = os.path.join(root, "A"), os.path.join(root, "B")
+    os.makedirs(a); os.makedirs(b)
+    watched = {a, b}
+    os.makedirs(os.path.join(a, "new1", "deep"))
+    os.makedirs(os.path.join(b, "new2"))
+
+    add_new_subdirs(root, [a, b], watched)
+
+    assert watched == {
+        a, b,
+        os.path.join(a, "new1"), os.path.join(a, "new1", "deep"),
+        os.path.join(b, "new2"),
+    }
+
+
+def test_folders_outside_root_are_ignored(tmp_path):
+    root = os.path.join(str(tmp_path), "para")
+    outside = os.path.join(str(tmp_path), "elsewhere")
+    os.makedirs(root); os.makedirs(os.path.join(outside, "sub"))
+
+    assert add_new_subdirs(root, [outside], set()) == set()